@@ -1,13 +1,28 @@
-from summarization.response import NYTimesScraper
-from summarization.sentiment_analyzer import SentimentAnalyzer
-from summarization.topic_extractor import NewsTopicExtractor
-from summarization.llm_response import CoverageComparison
-from utils import get_sentiment_distribution,analyze_article_topics_pairs
-from summarization.text_speech import TextToSpeechConverter
-from fastapi import FastAPI,HTTPException, APIRouter
-from typing import Dict,Any,List
+from summarization.response import scrape_cache
+from summarization.collector import article_collector
+from summarization.dedup import deduplicate_articles
+from summarization.history import report_history
+from summarization.model_registry import model_registry
+from summarization.llm_response import CoverageComparison, llm_cache, DEFAULT_MAX_CONCURRENCY
+from utils import get_sentiment_distribution,get_sentiment_statistics,analyze_article_topics_pairs
+from summarization.text_speech import TextToSpeechConverter, DEFAULT_OUTPUT_DIRECTORY, translator
+from summarization.metrics import metrics, trace, REQUESTS, REQUEST_SECONDS, STAGE_SECONDS, STAGE_ERRORS
+from summarization.resources import check_resources
+from jobs import ReportJobQueue
+from pipeline import StageGraph, MicroBatcher
+from fastapi import FastAPI,HTTPException, APIRouter, Request
+from fastapi.responses import StreamingResponse, Response
+from typing import Dict,Any,List,Optional,Callable
+from pydantic import BaseModel
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 
+import asyncio
+import httpx
+import json
 import os
+import re
+import time
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -15,20 +30,45 @@ news_report_router = APIRouter()
 
 gemini_api_key = os.getenv("GEMINI_API_KEY")
 
-def get_report(company_name: str,api_key = gemini_api_key)->Dict[str, Any]:
-    scraper = NYTimesScraper(company_name)
-    articles = scraper.get_articles()
-    sentiment_analyzer = SentimentAnalyzer(articles)
-    articles = sentiment_analyzer.analyze_articles()
-    news_topic_extractor = NewsTopicExtractor()
-    articles = news_topic_extractor.get_articles_with_topics(articles)
-    sentiment_distribution = get_sentiment_distribution(articles)
-    coverage = CoverageComparison(api_key)
-    coverage_differences, final_sentiment = coverage.get_all_analysis(articles)
-    topic_overlap = analyze_article_topics_pairs(articles)
-    converter = TextToSpeechConverter()
-    audio_file_path = converter.convert_english_to_hindi_audio(final_sentiment["Final Sentiment Analysis"])
+# Bounded pool for the CPU-bound (spaCy/VADER/HTML parsing) and blocking (translation/gTTS)
+# work of the async pipeline, so it never runs on the event loop
+report_executor = ThreadPoolExecutor(max_workers=int(os.getenv("REPORT_EXECUTOR_WORKERS", "4")))
 
+# Companies of a bulk run scraped at the same time; pages within each are bounded by the collector
+BULK_MAX_COMPANIES_IN_FLIGHT = int(os.getenv("BULK_MAX_COMPANIES_IN_FLIGHT", "8"))
+
+class ReportRequest(BaseModel):
+    company_name: str
+    use_cache: bool = True
+    debug: bool = False
+
+class BulkReportRequest(BaseModel):
+    company_names: List[str]
+    use_cache: bool = True
+    audio: bool = False
+
+# Shared HTTP connection pool for the async scrape, opened for the lifetime of the app
+http_client = None
+# Background load of the NLP models, started with the app
+model_warm_up = None
+
+def report_warm_up_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Model warm-up failed: {future.exception()}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client, model_warm_up
+    # Load the NLP models once, in the background, so the app answers /healthz right away
+    # and /readyz once no report has to pay for the load
+    model_warm_up = asyncio.get_running_loop().run_in_executor(None, model_registry.warm_up)
+    model_warm_up.add_done_callback(report_warm_up_failure)
+    http_client = httpx.AsyncClient(follow_redirects=True)
+    yield
+    await http_client.aclose()
+    http_client = None
+
+def simplify_articles(articles) -> List[Dict[str, Any]]:
     # Modified articles list to include only title, summary, sentiment, and topics
     simplified_articles = []
     for article in articles:
@@ -36,26 +76,610 @@ def get_report(company_name: str,api_key = gemini_api_key)->Dict[str, Any]:
             "Title": article.get("title"),
             "Summary": article.get("summary"),
             "Sentiment": article.get("sentiment"),
+            "Sentiment Score": article.get("sentiment_score"),
             "Topics": article.get("topics")
         })
+    return simplified_articles
 
+def build_report(company_name, articles, sentiment_distribution, coverage_differences,
+                 topic_overlap, final_sentiment, audio) -> Dict[str, Any]:
     result = {
         "Company": company_name,
-        "Articles": simplified_articles,  # Using the simplified articles list
+        "Articles": simplify_articles(articles),  # Using the simplified articles list
         "Comparative Sentiment Score": sentiment_distribution,
+        "Sentiment Statistics": get_sentiment_statistics(articles),
         "Coverage Differences": coverage_differences,
         "Topic Overlap": topic_overlap,
         "Final Sentiment Analysis": final_sentiment["Final Sentiment Analysis"],
-        "Audio": audio_file_path
+        **audio
     }
 
     return result
-       
+
+def audio_url(audio_file_path: Optional[str]) -> Optional[str]:
+    # Reports carry a URL on this API instead of a local path, so the UI needs no shared filesystem
+    if not audio_file_path:
+        return None
+    audio_id = os.path.splitext(os.path.basename(audio_file_path))[0]
+    return f"/audio/{audio_id}"
+
+def audio_tracks(paths_by_language) -> Dict[str, Any]:
+    tracks = {language: audio_url(path) for language, path in paths_by_language.items()}
+    return {"Audio": next(iter(tracks.values()), None), "Audio Tracks": tracks}
+
+def generate_audio(final_sentiment_text: str) -> Dict[str, Any]:
+    """
+    Converts the final sentiment text to audio in every configured language.
+
+    Returns:
+        dict: {"Audio": URL of the first language's audio, "Audio Tracks": {language: URL}}
+    """
+    return audio_tracks(TextToSpeechConverter().convert_to_audio_multi(final_sentiment_text))
+
+def generate_audio_many(final_sentiment_texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Converts several final sentiment texts to audio, translating them together.
+
+    Returns:
+        list: One {"Audio": ..., "Audio Tracks": ...} per text, in input order.
+    """
+    return [audio_tracks(paths) for paths in TextToSpeechConverter().convert_many_to_audio(final_sentiment_texts)]
+
+def stored_analyses(company_name, articles):
+    # For every article, its analysis from an earlier report, or None if it is new
+    if report_history is None:
+        return [None] * len(articles)
+    return report_history.lookup(company_name, articles)
+
+def score_sentiment(articles, stored):
+    """
+    Scores the sentiment of the new articles only and takes the others' from the store.
+
+    Returns:
+        list: Copies of all the articles, with 'sentiment' and 'sentiment_score', in input order.
+    """
+    new_articles = [article.copy() for article, known in zip(articles, stored) if known is None]
+    scored = iter(model_registry.get_sentiment_analyzer().analyze_articles(new_articles))
+    return [
+        next(scored) if known is None
+        else {**article, "sentiment": known["sentiment"], "sentiment_score": known["sentiment_score"]}
+        for article, known in zip(articles, stored)
+    ]
+
+def extract_topics(articles, stored):
+    """
+    Extracts the topics of the new articles only and takes the others' from the store.
+
+    Returns:
+        list: Copies of all the articles, with 'topics' where available, in input order.
+    """
+    new_articles = [article for article, known in zip(articles, stored) if known is None]
+    with_topics = iter(model_registry.get_topic_extractor().get_articles_with_topics(new_articles))
+    return [
+        next(with_topics) if known is None
+        else {**article, "topics": known["topics"]} if "topics" in known
+        else article.copy()
+        for article, known in zip(articles, stored)
+    ]
+
+def pooled_article_stage(fn):
+    """
+    Turns an fn(articles, stored) stage into a batch function over several companies'
+    (articles, stored) pairs, which makes one fn call over all of their articles.
+    """
+    def run(batch):
+        pooled = fn([article for articles, _ in batch for article in articles],
+                    [known for _, stored in batch for known in stored])
+        results, start = [], 0
+        for articles, _ in batch:
+            results.append(pooled[start:start + len(articles)])
+            start += len(articles)
+        return results
+    return run
+
+def record_history(company_name, articles, stored, final_sentiment):
+    # Every article is upserted so its last sighting is kept up to date
+    if report_history is not None:
+        report_history.store_articles(company_name, articles)
+        report_history.record_report(company_name, articles, sum(known is None for known in stored),
+                                     final_sentiment["Final Sentiment Analysis"])
+
+def merge_article_analyses(scored_articles, topic_articles):
+    # The sentiment and topic stages each work on their own copies of the articles
+    return [
+        {**scored, "topics": with_topics["topics"]} if "topics" in with_topics else scored
+        for scored, with_topics in zip(scored_articles, topic_articles)
+    ]
+
+def build_report_graph(company_name: str, notify, scrape, coverage, get_all_analysis,
+                       analyze_sentiment=score_sentiment, analyze_topics=extract_topics,
+                       audio=None) -> StageGraph:
+    """
+    Builds the stage graph of a report. Topics and sentiment only need the scraped
+    articles, so they run side by side; the article pairs for Gemini are picked from
+    the sentiment scores in a stage of their own, and the Gemini analysis runs
+    alongside topic extraction. Articles already in the report history are not
+    analyzed again.
+
+    Args:
+        company_name (str): The company to report on.
+        notify (callable): Called as notify(stage, partial) as parts of the report are
+                           ready, for the "articles", "sentiment", "final_sentiment" and
+                           "audio" stages. May be called from executor threads.
+        scrape (callable): Returns the articles of the company; may be a coroutine function.
+        coverage (CoverageComparison): Selects the pairs to compare, and stores the new
+                                       comparisons in the history stage.
+        get_all_analysis (callable): Takes the articles and their pairs and returns
+                                     (coverage_differences, final_sentiment); may be a
+                                     coroutine function.
+        analyze_sentiment (callable): Takes (articles, stored) and returns the scored
+                                      articles; may be a coroutine function.
+        analyze_topics (callable): Takes (articles, stored) and returns the articles
+                                   with their topics; may be a coroutine function.
+        audio (callable, optional): Takes (coverage_differences, final_sentiment) and
+                                    returns {"Audio", "Audio Tracks"}; may be a coroutine
+                                    function. Defaults to `generate_audio`.
+    """
+    def articles_ready(articles, dedup, stored):
+        notify("articles", {
+            "Company": company_name,
+            "Articles": simplify_articles(articles),
+            "Duplicates Collapsed": dedup[1],
+            "New Articles": sum(known is None for known in stored),
+        })
+
+    def sentiment_ready(articles, sentiment_distribution, topic_overlap):
+        notify("sentiment", {
+            "Comparative Sentiment Score": sentiment_distribution,
+            "Sentiment Statistics": get_sentiment_statistics(articles),
+            "Topic Overlap": topic_overlap,
+        })
+
+    def coverage_ready(analysis):
+        coverage_differences, final_sentiment = analysis
+        notify("final_sentiment", {
+            "Coverage Differences": coverage_differences,
+            "Final Sentiment Analysis": final_sentiment["Final Sentiment Analysis"],
+        })
+
+    if audio is None:
+        def audio(analysis):
+            return generate_audio(analysis[1]["Final Sentiment Analysis"])
+
+    def history(articles, stored, analysis):
+        coverage.store_new_comparisons()
+        record_history(company_name, articles, stored, analysis[1])
+
+    graph = StageGraph(observer=observe_stage)
+    graph.add("scrape", scrape)
+    # Near-duplicates are collapsed before any stage pays for them, Gemini included
+    graph.add("dedup", deduplicate_articles, deps=["scrape"])
+    graph.add("unique_articles", lambda dedup: dedup[0], deps=["dedup"])
+    graph.add("stored", lambda articles: stored_analyses(company_name, articles), deps=["unique_articles"])
+    graph.add("sentiment", analyze_sentiment, deps=["unique_articles", "stored"])
+    graph.add("topics", analyze_topics, deps=["unique_articles", "stored"])
+    # Gemini pairs are chosen by story similarity and sentiment contrast, so coverage waits for the scores
+    graph.add("pairs", coverage.select_pairs, deps=["sentiment"])
+    graph.add("coverage", get_all_analysis, deps=["sentiment", "pairs"])
+    graph.add("articles", merge_article_analyses, deps=["sentiment", "topics"])
+    graph.add("sentiment_distribution", get_sentiment_distribution, deps=["sentiment"])
+    graph.add("topic_overlap", analyze_article_topics_pairs, deps=["topics"])
+    graph.add("notify_articles", articles_ready, deps=["articles", "dedup", "stored"])
+    graph.add("notify_sentiment", sentiment_ready, deps=["articles", "sentiment_distribution", "topic_overlap"])
+    graph.add("notify_coverage", coverage_ready, deps=["coverage"])
+    graph.add("audio", audio, deps=["coverage"])
+    graph.add("notify_audio", lambda result: notify("audio", result), deps=["audio"])
+    graph.add("history", history, deps=["articles", "stored", "coverage"])
+    return graph
+
+def observe_stage(stage: str, seconds: float, failed: bool):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if failed:
+        STAGE_ERRORS.inc(stage=stage)
+
+def report_from_stages(company_name: str, results, timings, report_trace=None) -> Dict[str, Any]:
+    coverage_differences, final_sentiment = results["coverage"]
+    report = build_report(company_name, results["articles"], results["sentiment_distribution"],
+                          coverage_differences, results["topic_overlap"], final_sentiment, results["audio"])
+    report["Duplicates Collapsed"] = results["dedup"][1]
+    report["New Articles"] = sum(known is None for known in results["stored"])
+    report["Stage Timings"] = timings
+    if report_trace is not None:
+        # Per-stage breakdown: how long each stage took and which external calls it made
+        calls = report_trace.summary()
+        report["Debug"] = {
+            "Stages": {stage: {**timing, "External Calls": calls.get(stage, {})} for stage, timing in timings.items()}
+        }
+    return report
+
+def get_report(company_name: str,api_key = gemini_api_key, use_cache: bool = True,
+               on_stage: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+               debug: bool = False)->Dict[str, Any]:
+    """
+    Generates the full report for a company. Independent stages run concurrently and
+    the time each one took is returned under "Stage Timings".
+
+    Args:
+        company_name (str): The company to report on.
+        api_key (str): Gemini API key.
+        use_cache (bool): If False, cached Gemini responses are not reused.
+        on_stage (callable, optional): Called as on_stage(stage, partial) when a stage
+                                       finishes, with the report keys it produced.
+        debug (bool): If True, the report gains a "Debug" field with the external
+                      calls made by each stage.
+    """
+    notify = on_stage or (lambda stage, partial: None)
+    coverage = CoverageComparison(api_key, use_cache=use_cache, history=report_history)
+    graph = build_report_graph(company_name, notify,
+                               scrape=lambda: article_collector.collect_sync(company_name),
+                               coverage=coverage, get_all_analysis=coverage.get_all_analysis)
+    with trace() as report_trace:
+        results, timings = graph.run()
+    return report_from_stages(company_name, results, timings, report_trace if debug else None)
+
+async def get_report_async(company_name: str, api_key = gemini_api_key, use_cache: bool = True,
+                           debug: bool = False) -> Dict[str, Any]:
+    """
+    Non-blocking version of `get_report`. Network calls are awaited and CPU-bound or
+    blocking work runs in `report_executor`, so concurrent reports overlap their waits.
+    """
+    coverage = CoverageComparison(api_key, use_cache=use_cache, history=report_history)
+
+    async def scrape():
+        return await article_collector.collect(company_name, client=http_client, executor=report_executor)
+
+    graph = build_report_graph(company_name, lambda stage, partial: None,
+                               scrape=scrape, coverage=coverage,
+                               get_all_analysis=coverage.get_all_analysis_async)
+    with trace() as report_trace:
+        results, timings = await graph.run_async(executor=report_executor)
+    return report_from_stages(company_name, results, timings, report_trace if debug else None)
+
+async def iter_report_events(company_name: str, api_key = gemini_api_key, use_cache: bool = True):
+    """
+    Runs the report's stage graph and yields each part of the report as soon as it is ready.
+
+    Yields:
+        tuple: (stage, data) where data holds the report keys the stage produced. Each
+               "collecting" event reports one page of articles as it arrives, each
+               "coverage_difference" carries one comparison plus its pair "Index", and
+               the last event, "timings", holds the "Stage Timings" of the run.
+    """
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def notify(stage, data):
+        # Synchronous stages run in executor threads, so events are handed to the loop
+        loop.call_soon_threadsafe(events.put_nowait, (stage, data))
+
+    async def scrape():
+        articles = []
+        async for source, batch in article_collector.iter_articles(
+                company_name, client=http_client, executor=report_executor):
+            articles.extend(batch)
+            notify("collecting", {"Source": source, "New Articles": len(batch), "Collected": len(articles)})
+        return articles
+
+    coverage = CoverageComparison(api_key, use_cache=use_cache, history=report_history)
+
+    async def get_all_analysis(articles, pairs):
+        if coverage.batched:
+            coverage_differences, final_sentiment = await coverage.get_all_analysis_async(articles, pairs)
+            for index, difference in enumerate(coverage_differences):
+                notify("coverage_difference", {"Index": index, **difference})
+            return coverage_differences, final_sentiment
+        differences_by_index = {}
+        async for index, difference in coverage.iter_analysis_across_all_async(articles, pairs):
+            differences_by_index[index] = difference
+            notify("coverage_difference", {"Index": index, **difference})
+        coverage_differences = [differences_by_index[index] for index in sorted(differences_by_index)]
+        return coverage_differences, await coverage.get_final_sentiment_analysis_async(coverage_differences)
+
+    graph = build_report_graph(company_name, notify, scrape=scrape, coverage=coverage,
+                               get_all_analysis=get_all_analysis)
+    run = asyncio.ensure_future(graph.run_async(executor=report_executor))
+    try:
+        while not run.done():
+            next_event = asyncio.ensure_future(events.get())
+            await asyncio.wait({run, next_event}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event.done():
+                yield next_event.result()
+            else:
+                next_event.cancel()
+        _, timings = run.result()
+        # Events notified from executor threads may land on the loop just after the run ends
+        await asyncio.sleep(0)
+        while not events.empty():
+            yield events.get_nowait()
+        yield "timings", {"Stage Timings": timings}
+    finally:
+        run.cancel()
+
+async def iter_bulk_reports(company_names: List[str], api_key = gemini_api_key, use_cache: bool = True,
+                            audio: bool = False, client: Optional[httpx.AsyncClient] = None):
+    """
+    Generates the reports of many companies and yields each one as soon as it is done.
+
+    Every company runs the report's stage graph. Companies are scraped concurrently,
+    at most BULK_MAX_COMPANIES_IN_FLIGHT at a time, the sentiment and topic stages of
+    companies that reach them together are pooled into one VADER and one spaCy pass,
+    the audio texts are translated together, and every company's Gemini calls share a
+    single concurrency budget.
+
+    Args:
+        company_names (list): The companies to report on; repeats are reported once.
+        api_key (str): Gemini API key.
+        use_cache (bool): If False, cached Gemini responses are not reused.
+        audio (bool): If True, each report also gets its audio tracks.
+        client (httpx.AsyncClient, optional): Client for the scrapes. Defaults to the app's.
+
+    Yields:
+        dict: {"Company": name, "Report": report} or {"Company": name, "Error": detail},
+              in completion order.
+    """
+    client = client or http_client
+    scrape_slots = asyncio.Semaphore(BULK_MAX_COMPANIES_IN_FLIGHT)
+    gemini_slots = asyncio.Semaphore(DEFAULT_MAX_CONCURRENCY)
+    sentiment_batches = MicroBatcher(pooled_article_stage(score_sentiment), executor=report_executor)
+    topic_batches = MicroBatcher(pooled_article_stage(extract_topics), executor=report_executor)
+    audio_batches = MicroBatcher(generate_audio_many, executor=report_executor)
+
+    async def analyze_sentiment(articles, stored):
+        return await sentiment_batches.submit((articles, stored))
+
+    async def analyze_topics(articles, stored):
+        return await topic_batches.submit((articles, stored))
+
+    async def generate_tracks(analysis):
+        if not audio:
+            return {"Audio": None, "Audio Tracks": {}}
+        return await audio_batches.submit(analysis[1]["Final Sentiment Analysis"])
+
+    async def report(company_name):
+        async def scrape():
+            async with scrape_slots:
+                return await article_collector.collect(company_name, client=client, executor=report_executor)
+
+        coverage = CoverageComparison(api_key, use_cache=use_cache, history=report_history,
+                                      shared_semaphore=gemini_slots)
+        graph = build_report_graph(company_name, lambda stage, partial: None, scrape=scrape,
+                                   coverage=coverage,
+                                   get_all_analysis=coverage.get_all_analysis_async,
+                                   analyze_sentiment=analyze_sentiment, analyze_topics=analyze_topics,
+                                   audio=generate_tracks)
+        results, timings = await graph.run_async(executor=report_executor)
+        return report_from_stages(company_name, results, timings)
+
+    # Repeats of a company, whatever their case or spacing, are reported once
+    unique_names = {}
+    for name in company_names:
+        if name.strip():
+            unique_names.setdefault(scrape_cache.normalize_key(name), name.strip())
+    reports = {asyncio.ensure_future(report(name)): name for name in unique_names.values()}
+    try:
+        while reports:
+            done, _ = await asyncio.wait(reports, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                company_name = reports.pop(task)
+                try:
+                    yield {"Company": company_name, "Report": task.result()}
+                except Exception as e:
+                    yield {"Company": company_name, "Error": str(e)}
+    finally:
+        for task in reports:
+            task.cancel()
+
+@news_report_router.post("/reports/bulk")
+async def bulk_reports(request: BulkReportRequest) -> StreamingResponse:
+    """
+    Reports on a list of companies, streamed as NDJSON with one
+    {"Company": ..., "Report": ...} or {"Company": ..., "Error": ...} line per company
+    as each one completes.
+    """
+    async def ndjson_lines():
+        async for result in iter_bulk_reports(request.company_names, use_cache=request.use_cache,
+                                              audio=request.audio):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+@news_report_router.get("/report/{company_name}/stream")
+async def stream_report(company_name: str, use_cache: bool = True) -> StreamingResponse:
+    """
+    Streams the report as NDJSON, one {"stage": ..., "data": ...} object per line.
+    """
+    async def ndjson_lines():
+        try:
+            async for stage, data in iter_report_events(company_name, use_cache=use_cache):
+                yield json.dumps({"stage": stage, "data": data}) + "\n"
+            yield json.dumps({"stage": "done", "data": {}}) + "\n"
+        except Exception as e:
+            # The status code is already sent, so errors are reported in the stream
+            yield json.dumps({"stage": "error", "data": {"detail": str(e)}}) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
 @news_report_router.get("/report/{company_name}")
-async def generate_report(company_name: str) -> Dict[str,Any]:
+async def generate_report(company_name: str, use_cache: bool = True, debug: bool = False) -> Dict[str,Any]:
     try:
-        report = get_report(company_name)
+        report = await get_report_async(company_name, use_cache=use_cache, debug=debug)
         return report
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    
+
+# Background report jobs; concurrent requests for the same company share one job
+report_jobs = ReportJobQueue(get_report, max_workers=int(os.getenv("REPORT_JOB_WORKERS", "2")))
+
+@news_report_router.post("/reports", status_code=202)
+async def submit_report(request: ReportRequest) -> Dict[str,Any]:
+    job, created = report_jobs.submit(request.company_name, use_cache=request.use_cache, debug=request.debug)
+    return {"job_id": job["job_id"], "status": job["status"], "deduplicated": not created}
+
+@news_report_router.get("/reports/{job_id}")
+async def get_report_job(job_id: str) -> Dict[str,Any]:
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown report job: {job_id}")
+    return job
+
+@news_report_router.get("/history/{company_name}/sentiment")
+async def get_sentiment_history(company_name: str, period: str = "day", days: Optional[int] = None) -> Dict[str,Any]:
+    """
+    Sentiment over time of a company's articles, served from the report history
+    without recomputing anything.
+    """
+    if report_history is None:
+        raise HTTPException(status_code=404, detail="Report history is disabled")
+    since = time.time() - days * 86400 if days else None
+    try:
+        series = report_history.sentiment_over_time(company_name, period=period, since=since)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"Company": company_name, "Period": period, "Sentiment Over Time": series}
+
+@news_report_router.get("/history/{company_name}/reports")
+async def get_report_history(company_name: str, limit: int = 100) -> Dict[str,Any]:
+    if report_history is None:
+        raise HTTPException(status_code=404, detail="Report history is disabled")
+    return {"Company": company_name, "Reports": report_history.report_history(company_name, limit=limit)}
+
+@news_report_router.get("/healthz")
+async def healthz() -> Dict[str,Any]:
+    # Liveness only: answers as soon as the process serves requests, models warm or not
+    return {"status": "ok"}
+
+@news_report_router.get("/readyz")
+async def readyz() -> Dict[str,Any]:
+    """
+    Readiness: 200 once every model is loaded, 503 while they are warming up or if
+    loading failed, e.g. because a resource is not installed.
+    """
+    if model_warm_up is not None and model_warm_up.done() and not model_warm_up.cancelled() \
+            and model_warm_up.exception() is not None:
+        raise HTTPException(status_code=503, detail={
+            "status": "failed", "error": str(model_warm_up.exception()), "resources": check_resources(),
+        })
+    if not model_registry.ready():
+        raise HTTPException(status_code=503, detail={"status": "warming up", "resources": check_resources()})
+    return {"status": "ready", "models": model_registry.stats()}
+
+@news_report_router.get("/models")
+async def get_model_stats() -> Dict[str,Any]:
+    return model_registry.stats()
+
+@news_report_router.get("/cache/stats")
+async def get_cache_stats() -> Dict[str,Any]:
+    return {"llm": llm_cache.stats(), "scrape": scrape_cache.stats(), "translation": translator.stats(),
+            "history": report_history.stats() if report_history is not None else None}
+
+def collect_cache_metrics():
+    llm, scrape, translation = llm_cache.stats(), scrape_cache.stats(), translator.stats()
+    return [
+        ("cache_hits_total", "counter", "Cache lookups answered from the cache.", ["cache"], {
+            ("llm",): llm["hits"],
+            ("scrape",): scrape["fresh_hits"] + scrape["stale_hits"],
+            ("translation",): translation["hits"],
+        }),
+        ("cache_misses_total", "counter", "Cache lookups that had to go to the source.", ["cache"], {
+            ("llm",): llm["misses"],
+            ("scrape",): scrape["misses"],
+            ("translation",): translation["misses"],
+        }),
+    ]
+
+metrics.register_collector(collect_cache_metrics)
+
+async def metrics_middleware(request: Request, call_next):
+    """
+    Counts and times every request. Labelled with the route template rather than the
+    raw path, so company names don't each become a new series.
+    """
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        REQUESTS.inc(method=request.method, route=path, status=status)
+        REQUEST_SECONDS.observe(time.perf_counter() - start, method=request.method, route=path)
+
+@news_report_router.get("/metrics")
+def get_metrics() -> Response:
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
+
+AUDIO_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+AUDIO_CHUNK_SIZE = 64 * 1024
+
+def parse_range_header(range_header: str, file_size: int):
+    """
+    Parses a single-range "bytes=" Range header.
+
+    Returns:
+        tuple or None: (start, end) inclusive byte positions, or None if the range
+                       cannot be satisfied.
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.split(",")[0].strip())
+    if not match or (not match.group(1) and not match.group(2)):
+        return None
+    if not match.group(1):
+        # Suffix range: the last N bytes
+        length = int(match.group(2))
+        if length == 0:
+            return None
+        return max(file_size - length, 0), file_size - 1
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) else file_size - 1
+    if start >= file_size or end < start:
+        return None
+    return start, min(end, file_size - 1)
+
+def iter_file(path: str, start: int, length: int):
+    with open(path, "rb") as audio_file:
+        audio_file.seek(start)
+        while length > 0:
+            chunk = audio_file.read(min(AUDIO_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+@news_report_router.get("/audio/{audio_id}")
+def get_audio(audio_id: str, request: Request):
+    """
+    Streams a report's audio file, with Range support for seeking. Audio is
+    content-addressed, so it can be cached indefinitely.
+    """
+    if not AUDIO_ID_PATTERN.match(audio_id):
+        raise HTTPException(status_code=404, detail="Audio not found")
+    path = os.path.join(DEFAULT_OUTPUT_DIRECTORY, f"{audio_id}.mp3")
+    try:
+        file_size = os.path.getsize(path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "ETag": f'"{audio_id}"',
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if range_header is None:
+        headers["Content-Length"] = str(file_size)
+        return StreamingResponse(iter_file(path, 0, file_size), media_type="audio/mpeg", headers=headers)
+
+    byte_range = parse_range_header(range_header, file_size)
+    if byte_range is None:
+        headers["Content-Range"] = f"bytes */{file_size}"
+        return Response(status_code=416, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file(path, start, end - start + 1), status_code=206, media_type="audio/mpeg", headers=headers
+    )
@@ -1,9 +1,25 @@
+import os
+import json
 import streamlit as st
 import requests
-import base64
 import plotly.express as px
 import pandas as pd
 
+API_BASE_URL = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
+# Base URL of the API as seen from the user's browser. If set, the browser streams audio
+# straight from the API; otherwise this server fetches it and hands the bytes over
+API_PUBLIC_URL = os.getenv("API_PUBLIC_URL")
+REPORT_TIMEOUT_SECONDS = 300
+AUDIO_TIMEOUT_SECONDS = 60
+
+STAGE_MESSAGES = {
+    "collecting": "Collecting articles...",
+    "articles": "Articles analyzed, comparing coverage...",
+    "sentiment": "Articles analyzed, comparing coverage...",
+    "coverage_difference": "Comparing coverage...",
+    "final_sentiment": "Coverage compared, generating audio...",
+}
+
 def load_custom_css():
     st.markdown("""
     <style>
@@ -154,35 +170,44 @@ def create_sentiment_chart(sentiment_data):
     
     st.plotly_chart(fig, use_container_width=True)
 
-def display_audio(audio_path):
-    st.markdown("## 🎧 Audio Summary")
+def display_sentiment_statistics(statistics):
+    if not statistics:
+        return
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Average Sentiment Score", f"{statistics.get('mean', 0.0):+.2f}")
+    col2.metric("Net Sentiment", f"{statistics.get('net', 0.0):+.0%}")
+    col3.metric("Score Spread (std)", f"{statistics.get('std', 0.0):.2f}")
+
+def play_audio(url):
+    if API_PUBLIC_URL:
+        st.audio(f"{API_PUBLIC_URL}{url}", format="audio/mpeg")
+        return
+    # The API may only be reachable from this server (e.g. inside the container)
     try:
-        with open(audio_path, "rb") as audio_file:
-            audio_bytes = audio_file.read()
-        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-        audio_html = f"""
-        <div style="background-color: #f8fafc; padding: 15px; border-radius: 12px;">
-            <audio controls style="width:100%">
-                <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-            </audio>
-        </div>
-        """
-        st.markdown(audio_html, unsafe_allow_html=True)
-    except FileNotFoundError:
-        st.warning("Audio file not found.")
-
-def display_coverage_differences(differences):
-    st.markdown("## 🔍 Coverage Differences")
-    if not differences:
-        st.warning("No coverage differences available.")
+        response = requests.get(f"{API_BASE_URL}{url}", timeout=AUDIO_TIMEOUT_SECONDS)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        st.warning(f"Audio unavailable: {e}")
         return
-    for diff in differences:
-        st.markdown(f"""
-        <div class="comparison-item">
-            <p><strong>Comparison:</strong> {diff.get('Comparison', 'N/A')}</p>
-            <p><strong>Impact:</strong> {diff.get('Impact', 'N/A')}</p>
-        </div>
-        """, unsafe_allow_html=True)
+    st.audio(response.content, format="audio/mpeg")
+
+def display_audio(audio_url, tracks=None):
+    st.markdown("## 🎧 Audio Summary")
+    tracks = {language: url for language, url in (tracks or {}).items() if url}
+    if len(tracks) > 1:
+        for language, url in tracks.items():
+            st.caption(language)
+            play_audio(url)
+    elif audio_url:
+        play_audio(audio_url)
+
+def display_coverage_difference(diff):
+    st.markdown(f"""
+    <div class="comparison-item">
+        <p><strong>Comparison:</strong> {diff.get('Comparison', 'N/A')}</p>
+        <p><strong>Impact:</strong> {diff.get('Impact', 'N/A')}</p>
+    </div>
+    """, unsafe_allow_html=True)
 
 def display_topic_overlap(topics):
     st.markdown("## 📋 Topic Analysis")
@@ -203,6 +228,78 @@ def display_topic_overlap(topics):
             if words:
                 st.write(f"Article {i}: {', '.join(words) if words else 'No unique topics'}")
 
+def iter_report_stages(company_name):
+    """
+    Yields (stage, data) pairs from the streaming report endpoint as the API produces them.
+    """
+    api_url = f"{API_BASE_URL}/report/{company_name}/stream"
+    with requests.get(api_url, stream=True, timeout=REPORT_TIMEOUT_SECONDS) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if event["stage"] == "error":
+                raise RuntimeError(event["data"].get("detail", "Report generation failed"))
+            if event["stage"] == "done":
+                return
+            yield event["stage"], event["data"]
+
+def display_report_stream(company_name):
+    """
+    Renders each part of the report as soon as it arrives. The sections are laid out
+    up front so they keep their order whatever arrives first.
+    """
+    header = st.empty()
+    sentiment_section = st.container()
+    overall_section = st.container()
+    articles_section = st.container()
+    coverage_section = st.container()
+    topics_section = st.container()
+    audio_section = st.container()
+    status_text = st.empty()
+    status_text.caption("Fetching articles...")
+    coverage_started = False
+
+    for stage, data in iter_report_stages(company_name):
+        if stage == "articles":
+            header.markdown(f"## 📊 Media Analysis: {data.get('Company', company_name).capitalize()}")
+            with articles_section:
+                if data.get('Duplicates Collapsed'):
+                    st.caption(f"{data['Duplicates Collapsed']} near-duplicate articles were merged.")
+                display_articles(data.get('Articles', []))
+        elif stage == "sentiment":
+            with sentiment_section:
+                create_sentiment_chart(data.get('Comparative Sentiment Score', {}))
+                display_sentiment_statistics(data.get('Sentiment Statistics', {}))
+            with topics_section:
+                display_topic_overlap(data.get('Topic Overlap', {}))
+        elif stage == "coverage_difference":
+            with coverage_section:
+                # Comparisons can arrive before the sentiment section, so the header goes with the first one
+                if not coverage_started:
+                    st.markdown("## 🔍 Coverage Differences")
+                    coverage_started = True
+                display_coverage_difference(data)
+        elif stage == "final_sentiment":
+            if not coverage_started:
+                with coverage_section:
+                    st.markdown("## 🔍 Coverage Differences")
+                    st.warning("No coverage differences available.")
+                coverage_started = True
+            with overall_section:
+                st.markdown("## 💡 Overall Sentiment")
+                st.markdown(
+                    f'<div class="sentiment-text">{data.get("Final Sentiment Analysis", "No analysis available")}</div>',
+                    unsafe_allow_html=True
+                )
+        elif stage == "audio" and data.get('Audio'):
+            with audio_section:
+                display_audio(data['Audio'], data.get('Audio Tracks'))
+        status_text.caption(STAGE_MESSAGES.get(stage, "Finishing report..."))
+
+    status_text.empty()
+
 def main():
     load_custom_css()
     
@@ -219,29 +316,8 @@ def main():
     
     if generate_report and company_name:
         try:
-            api_url = f"http://127.0.0.1:8000/report/{company_name}"
-            with st.spinner('Fetching Report...'):
-                response = requests.get(api_url)
-                response.raise_for_status()
-                report = response.json()
-            
-            st.markdown(f"## 📊 Media Analysis: {report.get('Company', company_name).capitalize()}")
-            
-            create_sentiment_chart(report.get('Comparative Sentiment Score', {}))
-            
-            st.markdown("## 💡 Overall Sentiment")
-            st.markdown(
-                f'<div class="sentiment-text">{report.get("Final Sentiment Analysis", "No analysis available")}</div>',
-                unsafe_allow_html=True
-            )
-            
-            display_articles(report.get('Articles', []))
-            display_coverage_differences(report.get('Coverage Differences', []))
-            display_topic_overlap(report.get('Topic Overlap', {}))
-            
-            if report.get('Audio'):
-                display_audio(report['Audio'])
-            
+            display_report_stream(company_name)
+
         except requests.RequestException as e:
             st.error(f"Error fetching report: {e}")
         except Exception as e:
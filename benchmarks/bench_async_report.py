@@ -0,0 +1,131 @@
+"""
+Fires N concurrent /report requests at the API with the network backends
+(NYTimes scrape, Gemini, translation + gTTS) replaced by stubs that just wait,
+and compares the blocking pipeline with the async one.
+
+Usage:
+    python benchmarks/bench_async_report.py --requests 8 --latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Every report repeats the same articles; keep the history from skipping their analysis
+os.environ["REPORT_HISTORY_PATH"] = ""
+
+import api  # noqa: E402
+from summarization.llm_response import CoverageComparison  # noqa: E402
+from summarization.response import NYTimesScraper  # noqa: E402
+from summarization.text_speech import TextToSpeechConverter  # noqa: E402
+
+STUB_ARTICLES = [
+    {
+        "link": f"https://www.nytimes.com/2025/01/{i:02d}/business/story-{i}.html",
+        "title": f"Company posts record quarter number {i}",
+        "source": "Business",
+        "author": "By A Reporter",
+        "timestamp": "Jan 1, 2025",
+        "summary": f"The company reported strong earnings growth in quarter {i}, beating analyst expectations.",
+    }
+    for i in range(10)
+]
+
+
+def install_stubs(latency):
+    """Replaces every network call of the pipeline with a sleep of `latency` seconds."""
+
+    # The collector passes its per-host rate limiter as `throttle`, awaited before a real fetch
+    def get_articles(self, throttle=None):
+        if throttle is not None:
+            throttle()
+        time.sleep(latency)
+        return [dict(article) for article in STUB_ARTICLES]
+
+    async def get_articles_async(self, client=None, executor=None, throttle=None):
+        if throttle is not None:
+            await throttle()
+        await asyncio.sleep(latency)
+        return [dict(article) for article in STUB_ARTICLES]
+
+    def compare_two_articles(self, i, article1, article2, gemini_api_key, j=None):
+        time.sleep(latency)
+        return {"Comparison": "stub comparison", "Impact": "stub impact"}
+
+    async def compare_two_articles_async(self, i, article1, article2, j=None):
+        await asyncio.sleep(latency)
+        return {"Comparison": "stub comparison", "Impact": "stub impact"}
+
+    def get_final_sentiment_analysis(self, comparisons):
+        time.sleep(latency)
+        return {"Final Sentiment Analysis": "stub final sentiment"}
+
+    async def get_final_sentiment_analysis_async(self, comparisons):
+        await asyncio.sleep(latency)
+        return {"Final Sentiment Analysis": "stub final sentiment"}
+
+    def convert_to_audio(self, english_text, language, filename=None):
+        time.sleep(latency)
+        return "audio_outputs/stub.mp3"
+
+    NYTimesScraper.get_articles = get_articles
+    NYTimesScraper.get_articles_async = get_articles_async
+    CoverageComparison.compare_two_articles = compare_two_articles
+    CoverageComparison.compare_two_articles_async = compare_two_articles_async
+    CoverageComparison.get_final_sentiment_analysis = get_final_sentiment_analysis
+    CoverageComparison.get_final_sentiment_analysis_async = get_final_sentiment_analysis_async
+    TextToSpeechConverter.__init__ = lambda self, output_directory="audio_outputs": setattr(self, "languages", ["hi"])
+    TextToSpeechConverter.convert_to_audio = convert_to_audio
+
+
+def build_app():
+    app = FastAPI()
+    app.include_router(api.news_report_router)
+
+    # The pre-async endpoint: an async route that calls the synchronous pipeline
+    @app.get("/blocking/report/{company_name}")
+    async def blocking_report(company_name: str):
+        return api.get_report(company_name)
+
+    return app
+
+
+async def fire(app, path, n):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path.format(i=i)) for i in range(n)))
+        elapsed = time.perf_counter() - start
+    assert all(response.status_code == 200 for response in responses)
+    # A stub that no longer matches the scraper's signature fails inside the collector,
+    # which would benchmark empty reports
+    assert all(response.json()["Articles"] for response in responses), "a report has no articles"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=8, help="number of concurrent reports")
+    parser.add_argument("--latency", type=float, default=0.5, help="stubbed latency of each network call (s)")
+    args = parser.parse_args()
+
+    install_stubs(args.latency)
+    api.model_registry.warm_up()
+    app = build_app()
+
+    blocking = asyncio.run(fire(app, "/blocking/report/company{i}", args.requests))
+    non_blocking = asyncio.run(fire(app, "/report/company{i}", args.requests))
+
+    print(f"{args.requests} concurrent reports, {args.latency}s per stubbed network call")
+    print(f"  blocking pipeline: {blocking:.2f}s")
+    print(f"  async pipeline:    {non_blocking:.2f}s")
+    print(f"  speedup:           {blocking / non_blocking:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
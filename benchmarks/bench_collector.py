@@ -0,0 +1,85 @@
+"""
+Shows how collection wall time grows with the number of result pages. Every page is
+served by a stub source after a fixed latency, with 10 articles per page, and the
+pages are fetched one after another and then through ArticleCollector.
+
+Usage:
+    python benchmarks/bench_collector.py --pages 1 5 20 50 --latency 0.3 --concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from summarization.collector import ArticleCollector, HostRateLimiter  # noqa: E402
+
+
+class StubSource:
+    def __init__(self, name, pages, latency, per_page=10):
+        self.name = name
+        self.host = f"{name}.example"
+        self.page_count = pages
+        self.latency = latency
+        self.per_page = per_page
+
+    def pages(self, company_name):
+        return list(range(self.page_count))
+
+    def _articles(self, page):
+        return [
+            {"link": f"https://{self.host}/{page}/{n}", "title": f"{self.name} story {page}-{n}",
+             "source": self.name, "author": None, "timestamp": None, "summary": "Stub summary."}
+            for n in range(self.per_page)
+        ]
+
+    def fetch(self, company_name, page, throttle=None):
+        if throttle is not None:
+            throttle()
+        time.sleep(self.latency)
+        return self._articles(page)
+
+    async def fetch_async(self, company_name, page, client=None, executor=None, throttle=None):
+        if throttle is not None:
+            await throttle()
+        await asyncio.sleep(self.latency)
+        return self._articles(page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20, 50])
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=0, help="Requests per second per host (0: unlimited)")
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'articles':>9} {'sequential s':>13} {'collector s':>12} {'async s':>8}")
+    for pages in args.pages:
+        # Two sources on two hosts, so per-host limits apply to each separately
+        sources = [StubSource("alpha", (pages + 1) // 2, args.latency), StubSource("beta", pages // 2, args.latency)]
+
+        start = time.perf_counter()
+        sequential = [article for source in sources for page in source.pages("Tesla")
+                      for article in source.fetch("Tesla", page)]
+        sequential_seconds = time.perf_counter() - start
+
+        collector = ArticleCollector(sources, HostRateLimiter(args.rate, burst=args.concurrency),
+                                     max_concurrency=args.concurrency)
+        start = time.perf_counter()
+        collected = collector.collect_sync("Tesla")
+        collector_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        collected_async = asyncio.run(collector.collect("Tesla"))
+        async_seconds = time.perf_counter() - start
+
+        assert collected == sequential == collected_async, "collector output differs from sequential fetch"
+        print(f"{pages:>6} {len(collected):>9} {sequential_seconds:>13.2f} {collector_seconds:>12.2f} "
+              f"{async_seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
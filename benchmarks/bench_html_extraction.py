@@ -0,0 +1,51 @@
+"""
+Compares the BeautifulSoup "html.parser" extraction of NYTimes search results with
+the lxml/XPath fast path on the recorded search page, repeated to 10, 100 and 1000
+results, and checks that both return the same article dictionaries.
+
+Usage:
+    python benchmarks/bench_html_extraction.py --sizes 10 100 1000 --repeat 10
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_pipeline import ReplayResponse, search_page  # noqa: E402
+from summarization.response import NYTimesScraper  # noqa: E402
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    scraper = NYTimesScraper("Tesla", cache=None)
+    print(f"{'results':>8} {'page KiB':>9} {'soup ms':>9} {'lxml ms':>9} {'speedup':>8}")
+    for size in args.sizes:
+        page = ReplayResponse(search_page(size))
+        soup_articles = scraper.extract_article_info_soup(page)
+        lxml_articles = scraper.extract_article_info_lxml(page)
+        assert soup_articles == lxml_articles, "lxml extraction differs from html.parser extraction"
+
+        soup_seconds = best_of(lambda: scraper.extract_article_info_soup(page), args.repeat)
+        lxml_seconds = best_of(lambda: scraper.extract_article_info_lxml(page), args.repeat)
+        print(f"{size:>8} {len(page.content) / 1024:>9.1f} {soup_seconds * 1000:>9.2f} "
+              f"{lxml_seconds * 1000:>9.2f} {soup_seconds / lxml_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Measures the cold import time of the API process, which bounds how fast a container
+can start answering /healthz.
+
+Each module is imported in a fresh interpreter, `--repeat` times, and the p50/p95 wall
+time is reported along with the slowest imports (from `python -X importtime`) and
+any heavy dependency that got imported eagerly although it should load lazily.
+
+Save a run with --output and pass it to a later run with --baseline to flag p50
+regressions beyond --tolerance; the script then exits with status 1.
+
+Usage:
+    python benchmarks/bench_import_time.py --repeat 10
+    python benchmarks/bench_import_time.py --modules api main --top 15
+    python benchmarks/bench_import_time.py --baseline before.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from summarization.resources import LAZY_MODULES  # noqa: E402
+
+
+def run_import(module, importtime=False):
+    """
+    Imports `module` in a fresh interpreter.
+
+    Returns:
+        tuple: (wall seconds, stderr output, list of lazy modules that were imported)
+    """
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+    eager = [name for name in completed.stdout.strip().split(",") if name]
+    return seconds, completed.stderr, eager
+
+
+def slowest_imports(importtime_output, top):
+    """
+    Parses `-X importtime` output into the `top` modules with the largest cumulative time.
+
+    Returns:
+        list: (module, cumulative milliseconds) tuples, slowest first.
+    """
+    entries = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            entries.append((name.strip(), int(cumulative) / 1000))
+    return sorted(entries, key=lambda entry: -entry[1])[:top]
+
+
+def measure(module, repeat, top):
+    latencies, eager = [], []
+    for _ in range(repeat):
+        seconds, _, eager = run_import(module)
+        latencies.append(seconds)
+    _, importtime_output, _ = run_import(module, importtime=True)
+    return {
+        "module": module,
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 1),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 1),
+        "eager_heavy_modules": eager,
+        "slowest_imports": [
+            {"module": name, "cumulative_ms": round(ms, 1)} for name, ms in slowest_imports(importtime_output, top)
+        ],
+    }
+
+
+def compare_to_baseline(results, baseline_path, tolerance):
+    """
+    Returns the modules whose p50 import time grew by more than `tolerance` over the baseline.
+    """
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = {row["module"]: row for row in json.load(baseline_file)["results"]}
+    regressions = []
+    for row in results:
+        before = baseline.get(row["module"])
+        if before and before["p50_ms"] and row["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+            regressions.append((row["module"], before["p50_ms"], row["p50_ms"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=["api", "main"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative p50 slowdown against the baseline (default: 0.2)")
+    args = parser.parse_args()
+
+    results = []
+    for module in args.modules:
+        result = measure(module, args.repeat, args.top)
+        results.append(result)
+        print(f"import {module}: p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms")
+        for entry in result["slowest_imports"]:
+            print(f"    {entry['cumulative_ms']:>10.1f} ms  {entry['module']}")
+        if result["eager_heavy_modules"]:
+            print(f"    imported eagerly: {', '.join(result['eager_heavy_modules'])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"repeat": args.repeat, "results": results}, output_file, indent=2)
+
+    failed = any(result["eager_heavy_modules"] for result in results)
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        for module, before, after in regressions:
+            print(f"REGRESSION import {module}: p50 {before:.1f} ms -> {after:.1f} ms")
+        if not regressions:
+            print(f"No p50 regression beyond {args.tolerance:.0%} of {args.baseline}")
+        failed = failed or bool(regressions)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
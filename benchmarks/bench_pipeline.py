@@ -0,0 +1,279 @@
+"""
+Offline benchmark of the report pipeline. A recorded NYTimes search page and canned
+Gemini, translation and TTS responses are replayed through local stubs, so no
+network access is needed and results are comparable between runs.
+
+Each stage is measured at several article counts:
+    extract_article_info, deduplicate, analyze_articles, get_articles_with_topics,
+    analyze_article_topics_pairs and get_report end to end.
+For each one the p50/p95 latency, throughput (articles per second, from the p50)
+and peak Python memory (tracemalloc, one extra run) are reported.
+
+Save a run with --output and pass it to a later run with --baseline to flag p50
+regressions beyond --tolerance; the script then exits with status 1.
+
+Usage:
+    python benchmarks/bench_pipeline.py --sizes 10 50 200 --repeat 20
+    python benchmarks/bench_pipeline.py --output before.json
+    python benchmarks/bench_pipeline.py --baseline before.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+sys.path.insert(0, ROOT)
+
+# Keep generated audio, cached responses and the report history out of the working tree
+os.environ.setdefault("AUDIO_OUTPUT_DIRECTORY", tempfile.mkdtemp(prefix="bench-audio-"))
+os.environ.pop("LLM_CACHE_PATH", None)
+os.environ["REPORT_HISTORY_PATH"] = os.path.join(tempfile.mkdtemp(prefix="bench-history-"), "history.db")
+
+import api  # noqa: E402
+import utils  # noqa: E402
+from summarization import collector, dedup, llm_response, response, text_speech  # noqa: E402
+from summarization.model_registry import model_registry  # noqa: E402
+
+ARTICLE_PATTERN = re.compile(r'<li class="[^"]*" data-testid="search-bodega-result">.*?</li>', re.S)
+SUMMARY_PATTERN = re.compile(r'<p class="css-e5tzus">(.*?)</p>', re.S)
+RESULTS_PATTERN = re.compile(r'(<ol data-testid="search-results">).*?(</ol>)', re.S)
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as fixture:
+        return fixture.read()
+
+
+def search_page(size):
+    """
+    Returns the recorded search page with `size` results, repeating the recorded
+    ones with numbered titles so every article stays distinct.
+    """
+    page = load_fixture("nytimes_search.html")
+    recorded = ARTICLE_PATTERN.findall(page)
+    items = []
+    for n in range(size):
+        item = recorded[n % len(recorded)]
+        if n >= len(recorded):
+            # Shuffle the summary's words so copies are not collapsed as near-duplicates
+            summary = SUMMARY_PATTERN.search(item).group(1).split()
+            random.Random(n).shuffle(summary)
+            item = SUMMARY_PATTERN.sub(lambda m: m.group(0).replace(m.group(1), " ".join(summary)), item)
+            item = item.replace('</h4>', f' ({n // len(recorded)})</h4>')
+        items.append(item)
+    return RESULTS_PATTERN.sub(lambda m: m.group(1) + "\n".join(items) + m.group(2), page)
+
+
+class ReplayResponse:
+    """The parts of requests.Response / httpx.Response the scraper reads."""
+
+    def __init__(self, text):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.status_code = 200
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+class ReplaySession:
+    def __init__(self, pages, latency):
+        self.pages = pages
+        self.latency = latency
+        self.size = None
+
+    def get(self, url, headers=None, timeout=None):
+        time.sleep(self.latency)
+        return ReplayResponse(self.pages[self.size])
+
+
+class CannedGemini:
+    """Answers each prompt type with its canned response, for the sync and async clients."""
+
+    def __init__(self, responses, latency):
+        self.responses = responses
+        self.latency = latency
+        self.models = self
+        self.aio = type("Aio", (), {"models": type("Models", (), {"generate_content": self._generate_async})()})()
+
+    def _answer(self, prompt):
+        if prompt.startswith("Compare the two articles of each pair"):
+            pairs = len(re.findall(r"^\s*Pair \d+:", prompt, re.M))
+            return json.dumps({
+                "Coverage Differences": [
+                    {"Pair": n, **self.responses["batched_difference"]} for n in range(1, pairs + 1)
+                ],
+                "Final Sentiment Analysis": self.responses["batched_final_sentiment"],
+            })
+        if prompt.startswith("Compare these articles"):
+            return self.responses["comparison"]
+        return self.responses["final_sentiment"]
+
+    def generate_content(self, model, contents):
+        time.sleep(self.latency)
+        return type("Response", (), {"text": self._answer(contents[0])})()
+
+    async def _generate_async(self, model, contents):
+        await asyncio.sleep(self.latency)
+        return type("Response", (), {"text": self._answer(contents[0])})()
+
+
+class SilentTTS:
+    """Stands in for gTTS and writes a fixed MP3 frame."""
+
+    FRAME = b"ID3\x04\x00\x00\x00\x00\x00\x00" + b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+    def __init__(self, text, lang):
+        self.text = text
+
+    def save(self, path):
+        with open(path, "wb") as audio_file:
+            audio_file.write(self.FRAME)
+
+
+def install_stubs(sizes, latency):
+    """
+    Replaces the network backends with replays of the fixtures.
+
+    Returns:
+        ReplaySession: The session serving the search pages; set its `size` to choose one.
+    """
+    replay = ReplaySession({size: search_page(size) for size in sizes}, latency)
+    response.session = replay
+    # Replayed requests are not rate limited
+    collector.article_collector.rate_limiter = collector.HostRateLimiter(rate_per_second=0)
+    gemini = CannedGemini(json.loads(load_fixture("gemini_responses.json")), latency)
+    llm_response.CoverageComparison.client = property(lambda self: gemini)
+    translations = json.loads(load_fixture("translations.json"))
+    text_speech.translator.backend = text_speech.LocalTranslationBackend({
+        (text, language): translated
+        for language, by_text in translations.items()
+        for text, translated in by_text.items()
+    })
+    # The converter imports gTTS when it synthesizes, so the stub goes on the gtts module
+    import gtts
+    gtts.gTTS = SilentTTS
+    return replay
+
+
+def measure(fn, repeat):
+    """
+    Runs fn `repeat` times, then once more under tracemalloc.
+
+    Returns:
+        dict: {"p50_ms", "p95_ms", "peak_memory_kb"}
+    """
+    # The pipeline prints progress; keep it out of the results table
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()  # Warm-up, not measured
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            latencies.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def run_suite(sizes, repeat, replay):
+    sentiment_analyzer = model_registry.get_sentiment_analyzer()
+    topic_extractor = model_registry.get_topic_extractor()
+    scraper = response.NYTimesScraper("Tesla", cache=None)
+    # Report names are unique per call so the scrape cache never answers
+    calls = iter(range(10 ** 9))
+    results = []
+
+    for size in sizes:
+        replay.size = size
+        page = ReplayResponse(replay.pages[size])
+        articles = scraper.extract_article_info(page)
+        scored = sentiment_analyzer.analyze_articles([dict(article) for article in articles])
+        with_topics = topic_extractor.get_articles_with_topics(scored)
+
+        stages = {
+            "extract_article_info": lambda: scraper.extract_article_info(page),
+            "deduplicate": lambda: dedup.near_duplicate_detector.deduplicate(articles),
+            "analyze_articles": lambda: sentiment_analyzer.analyze_articles([dict(a) for a in articles]),
+            "get_articles_with_topics": lambda: topic_extractor.get_articles_with_topics(scored),
+            "analyze_article_topics_pairs": lambda: utils.analyze_article_topics_pairs(with_topics),
+            "get_report": lambda: api.get_report(f"Tesla {next(calls)}", api_key="offline", use_cache=False),
+        }
+        for stage, fn in stages.items():
+            stats = measure(fn, repeat)
+            stats["articles_per_second"] = round(size / (stats["p50_ms"] / 1000), 1) if stats["p50_ms"] else None
+            results.append({"stage": stage, "articles": size, **stats})
+            print(f"{stage:>30} {size:>8} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} "
+                  f"{stats['articles_per_second'] or 0:>12.1f} {stats['peak_memory_kb']:>12.1f}")
+    return results
+
+
+def compare_to_baseline(results, baseline_path, tolerance):
+    """
+    Returns the stages whose p50 latency grew by more than `tolerance` over the baseline.
+    """
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = {(row["stage"], row["articles"]): row for row in json.load(baseline_file)["results"]}
+    regressions = []
+    for row in results:
+        before = baseline.get((row["stage"], row["articles"]))
+        if before and before["p50_ms"] and row["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+            regressions.append((row["stage"], row["articles"], before["p50_ms"], row["p50_ms"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds each replayed network call waits (default: 0, CPU only)")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative p50 slowdown against the baseline (default: 0.2)")
+    args = parser.parse_args()
+
+    replay = install_stubs(args.sizes, args.latency)
+    print(f"{'stage':>30} {'articles':>8} {'p50 ms':>10} {'p95 ms':>10} {'articles/s':>12} {'peak KiB':>12}")
+    results = run_suite(args.sizes, args.repeat, replay)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"sizes": args.sizes, "repeat": args.repeat, "latency": args.latency,
+                       "results": results}, output_file, indent=2)
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        for stage, size, before, after in regressions:
+            print(f"REGRESSION {stage} @ {size} articles: p50 {before:.2f} ms -> {after:.2f} ms")
+        if regressions:
+            sys.exit(1)
+        print(f"No p50 regression beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compares per-document topic extraction (one `nlp(summary)` call per article) with
+the batched `nlp.pipe` path on 10, 100 and 1000 summaries, and checks that the
+batched path over the trimmed pipeline finds the same spaCy topics as the full,
+untrimmed model run one document at a time (the TF-IDF fallback differs by design,
+since the batched path fits it over the whole batch).
+
+Usage:
+    python benchmarks/bench_topic_extraction.py --batch-size 64 --n-process 1
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spacy  # noqa: E402
+
+from summarization.resources import SPACY_MODEL  # noqa: E402
+from summarization.topic_extractor import NewsTopicExtractor  # noqa: E402
+
+COMPANIES = ["Tesla", "Apple", "Boeing", "Nvidia", "Walmart", "Ford"]
+TEMPLATES = [
+    "{company} shares fell after regulators in Washington opened an inquiry into its {product} business.",
+    "Analysts at Goldman Sachs raised their forecast for {company} as demand for its {product} grew.",
+    "{company} said its chief executive would step down after a difficult year for the {product} division.",
+    "Investors cheered as {company} reported record profit from {product} sales in China and Europe.",
+]
+PRODUCTS = ["electric vehicle", "smartphone", "aircraft", "chip", "retail", "truck"]
+
+
+def make_summaries(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(company=rng.choice(COMPANIES), product=rng.choice(PRODUCTS))
+        for _ in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    extractor = NewsTopicExtractor(batch_size=args.batch_size, n_process=args.n_process)
+    # Warm up both paths so neither pays for lazy initialisation
+    extractor.extract_topics(make_summaries(1)[0])
+    extractor.extract_topics_batch(make_summaries(2))
+    # Reference for the topics: the model with every pipe, including those the extractor excludes
+    full_nlp = spacy.load(SPACY_MODEL)
+
+    print(f"{'summaries':>10} {'per-doc/s':>12} {'piped/s':>12} {'speedup':>8}")
+    for size in args.sizes:
+        summaries = make_summaries(size)
+
+        start = time.perf_counter()
+        per_doc = [extractor.extract_topics(summary) for summary in summaries]
+        per_doc_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        piped = extractor.extract_topics_batch(summaries)
+        piped_seconds = time.perf_counter() - start
+
+        spacy_full = [extractor._topics_from_doc(full_nlp(summary)) for summary in summaries]
+        spacy_piped = [extractor._topics_from_doc(doc) for doc in extractor.nlp.pipe(summaries)]
+        assert spacy_full == spacy_piped, "batched topics of the trimmed pipeline differ from the full model's"
+        print(f"{size:>10} {size / per_doc_seconds:>12.1f} {size / piped_seconds:>12.1f} "
+              f"{per_doc_seconds / piped_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Runs a watchlist of company reports in one process and writes them as NDJSON,
+one {"Company": ..., "Report": ...} or {"Company": ..., "Error": ...} line per
+company as soon as it completes.
+
+Usage:
+    python bulk_report.py Tesla Apple Nvidia
+    python bulk_report.py --watchlist watchlist.txt --output reports.ndjson
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+import httpx
+
+from api import iter_bulk_reports
+from summarization.model_registry import model_registry
+
+
+def read_watchlist(path):
+    """
+    Reads one company name per line, ignoring blank lines and "#" comments.
+    """
+    with open(path, encoding="utf-8") as watchlist:
+        return [line.strip() for line in watchlist if line.strip() and not line.lstrip().startswith("#")]
+
+
+async def run(company_names, output, use_cache, audio):
+    model_registry.warm_up()
+    completed = failed = 0
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        async for result in iter_bulk_reports(company_names, use_cache=use_cache, audio=audio, client=client):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            if "Error" in result:
+                failed += 1
+            else:
+                completed += 1
+    return completed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("companies", nargs="*", help="Company names to report on")
+    parser.add_argument("--watchlist", help="File with one company name per line")
+    parser.add_argument("--output", help="NDJSON file to write (default: stdout)")
+    parser.add_argument("--no-cache", action="store_true", help="Do not reuse cached Gemini responses")
+    parser.add_argument("--audio", action="store_true", help="Also generate the audio of every report")
+    args = parser.parse_args()
+
+    company_names = list(args.companies)
+    if args.watchlist:
+        company_names.extend(read_watchlist(args.watchlist))
+    if not company_names:
+        parser.error("no companies given; pass names or --watchlist")
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        completed, failed = asyncio.run(run(company_names, output, not args.no_cache, args.audio))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"{completed} reports written, {failed} failed", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ReportJob:
+    """
+    The state of one background report, as seen by clients polling for it.
+    """
+
+    def __init__(self, company_name, key):
+        self.id = uuid.uuid4().hex
+        self.company_name = company_name
+        self.key = key
+        self.status = "queued"  # queued -> running -> completed | failed
+        self.stage = None
+        self.partial = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+    @property
+    def finished(self):
+        return self.status in ("completed", "failed")
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "company_name": self.company_name,
+            "status": self.status,
+            "stage": self.stage,
+            "partial": dict(self.partial),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class ReportJobQueue:
+    """
+    An in-process queue that runs reports on a worker pool.
+
+    Requests for a company that already has a queued or running job with the same
+    options share that job instead of starting a new one.
+    """
+
+    def __init__(self, report_fn, max_workers=2, max_finished_jobs=500):
+        """
+        Initializes the queue.
+
+        Args:
+            report_fn (callable): Called as report_fn(company_name, on_stage=..., **options)
+                                  and returns the full report. on_stage(stage, partial) is
+                                  called as each stage finishes.
+            max_workers (int): Number of reports generated at the same time.
+            max_finished_jobs (int): Number of finished jobs kept for polling.
+        """
+        self.report_fn = report_fn
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-job")
+        self._jobs = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_key(company_name):
+        return " ".join(company_name.lower().split())
+
+    def submit(self, company_name, **options):
+        """
+        Queues a report, or joins the in-flight job for the same company and options.
+
+        Args:
+            company_name (str): The company to report on.
+            **options: Extra keyword arguments passed to the report function.
+
+        Returns:
+            tuple: (job, created) where job is a snapshot dictionary of the job and
+                   created is False if an in-flight job was reused.
+        """
+        # A fresh (use_cache=False) or debug request must not get the result of a different job
+        key = (self.normalize_key(company_name), tuple(sorted(options.items())))
+        with self._lock:
+            job_id = self._in_flight.get(key)
+            if job_id is not None:
+                return self._jobs[job_id].to_dict(), False
+
+            job = ReportJob(company_name, key)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job.id
+            self._prune_finished()
+            snapshot = job.to_dict()
+
+        self._executor.submit(self._run, job, options)
+        return snapshot, True
+
+    def get(self, job_id):
+        """
+        Returns a snapshot of the job with the given ID.
+
+        Returns:
+            dict or None: The job as a dictionary, or None if it is unknown or was pruned.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job is not None else None
+
+    def _run(self, job, options):
+        def on_stage(stage, partial):
+            with self._lock:
+                job.stage = stage
+                job.partial.update(partial)
+                job.updated_at = time.time()
+
+        with self._lock:
+            job.status = "running"
+            job.updated_at = time.time()
+        try:
+            result = self.report_fn(job.company_name, on_stage=on_stage, **options)
+            with self._lock:
+                job.result = result
+                job.status = "completed"
+        except Exception as e:
+            print(f"Report job {job.id} for {job.company_name} failed: {e}")
+            with self._lock:
+                job.error = str(e)
+                job.status = "failed"
+        finally:
+            with self._lock:
+                job.updated_at = time.time()
+                self._in_flight.pop(job.key, None)
+
+    def _prune_finished(self):
+        # Drop the oldest finished jobs once too many are kept; in-flight jobs are never dropped
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -1,4 +1,5 @@
 from fastapi import FastAPI
-from api import news_report_router
-app = FastAPI()
+from api import news_report_router, lifespan, metrics_middleware
+app = FastAPI(lifespan=lifespan)
+app.middleware("http")(metrics_middleware)
 app.include_router(news_report_router)
@@ -0,0 +1,225 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from summarization.metrics import current_stage
+
+
+class Stage:
+    """
+    A named step of a report and the stages whose results it takes as arguments.
+    """
+
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+
+class StageGraph:
+    """
+    A small dependency graph of report stages.
+
+    Each stage is called with the results of its dependencies, in the order they
+    were listed, as soon as all of them are available. Stages that do not depend
+    on each other run concurrently, so the wall time of a run approaches that of
+    its longest dependency chain rather than the sum of all stages.
+    """
+
+    def __init__(self, observer=None):
+        """
+        Args:
+            observer (callable, optional): Called as observer(stage, seconds, failed)
+                                           after every stage, e.g. to record metrics.
+        """
+        self._stages = OrderedDict()
+        self.observer = observer
+
+    def add(self, name, fn, deps=()):
+        """
+        Registers a stage. Dependencies must be registered first, which keeps the
+        graph acyclic.
+
+        Args:
+            name (str): Unique stage name; its result is stored under this name.
+            fn (callable): Called as fn(*dependency_results). May be a coroutine
+                           function when the graph is run with `run_async`.
+            deps (iterable): Names of the stages this one needs.
+
+        Returns:
+            StageGraph: The graph, so calls can be chained.
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' is already registered")
+        missing = [dep for dep in deps if dep not in self._stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {', '.join(missing)}")
+        self._stages[name] = Stage(name, fn, deps)
+        return self
+
+    def _ready(self, done, started):
+        return [
+            stage for name, stage in self._stages.items()
+            if name not in started and all(dep in done for dep in stage.deps)
+        ]
+
+    def _record(self, timings, name, run_start, start, failed):
+        end = time.perf_counter()
+        timings[name] = {"start": round(start - run_start, 4), "seconds": round(end - start, 4)}
+        if self.observer is not None:
+            self.observer(name, end - start, failed)
+
+    def run(self, max_workers=None):
+        """
+        Runs every stage on a thread pool. If a stage raises, stages that have not
+        started yet are skipped and the exception is re-raised.
+
+        Args:
+            max_workers (int, optional): Maximum number of stages run at once.
+                                         Defaults to the number of stages.
+
+        Returns:
+            tuple: (results, timings) where results maps stage names to their return
+                   values and timings maps stage names to {"start", "seconds"},
+                   measured from the start of the run.
+        """
+        results, timings = {}, {}
+        run_start = time.perf_counter()
+
+        def call(stage):
+            current_stage.set(stage.name)
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = stage.fn(*[results[dep] for dep in stage.deps])
+                failed = False
+                return result
+            finally:
+                self._record(timings, stage.name, run_start, start, failed)
+
+        # Stages run in copies of the caller's context, so context variables set around
+        # the run (such as a metrics trace) are visible to them
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=max_workers or max(len(self._stages), 1),
+                                thread_name_prefix="report-stage") as executor:
+            running = {}
+            while len(results) < len(self._stages):
+                for stage in self._ready(results, set(results) | set(running.values())):
+                    running[executor.submit(context.copy().run, call, stage)] = stage.name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception:
+                        for pending in running:
+                            pending.cancel()
+                        raise
+        return results, timings
+
+    async def run_async(self, executor=None):
+        """
+        Runs every stage on the event loop. Coroutine functions are awaited, other
+        stages run in `executor` so they never block the loop.
+
+        Args:
+            executor (Executor, optional): Executor for the synchronous stages.
+                                           Defaults to the loop's default executor.
+
+        Returns:
+            tuple: (results, timings), as returned by `run`.
+        """
+        loop = asyncio.get_running_loop()
+        results, timings = {}, {}
+        run_start = time.perf_counter()
+
+        async def call(stage):
+            current_stage.set(stage.name)
+            args = [results[dep] for dep in stage.deps]
+            start = time.perf_counter()
+            failed = True
+            try:
+                if inspect.iscoroutinefunction(stage.fn):
+                    result = await stage.fn(*args)
+                else:
+                    result = await loop.run_in_executor(
+                        executor, functools.partial(contextvars.copy_context().run, stage.fn, *args)
+                    )
+                failed = False
+                return result
+            finally:
+                self._record(timings, stage.name, run_start, start, failed)
+
+        running = {}
+        try:
+            while len(results) < len(self._stages):
+                for stage in self._ready(results, set(results) | set(running.values())):
+                    running[asyncio.ensure_future(call(stage))] = stage.name
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    results[running.pop(task)] = task.result()
+        finally:
+            for task in running:
+                task.cancel()
+        return results, timings
+
+
+class MicroBatcher:
+    """
+    Pools the calls of concurrent tasks into batches for a function that is cheaper
+    per item when given many items at once, such as a model pass over many texts.
+
+    The first call starts a batch on the next turn of the event loop; calls made
+    while a batch runs are pooled into the next one, so batches grow with the load
+    and no call waits on a timer.
+    """
+
+    def __init__(self, fn, executor=None):
+        """
+        Args:
+            fn (callable): Called as fn(items) in `executor` and returns one result per
+                           item, in the same order.
+            executor (Executor, optional): Executor for `fn`. Defaults to the loop's
+                                           default executor.
+        """
+        self.fn = fn
+        self.executor = executor
+        self._pending = []
+        self._drain_task = None
+
+    async def submit(self, item):
+        """
+        Adds an item to the next batch and waits for its result.
+
+        Raises:
+            Exception: Whatever `fn` raised for the batch the item was in.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if self._drain_task is None:
+            self._drain_task = asyncio.ensure_future(self._drain())
+        return await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        try:
+            # Let the callers that are ready on this turn join the first batch
+            await asyncio.sleep(0)
+            while self._pending:
+                batch, self._pending = self._pending, []
+                try:
+                    results = await loop.run_in_executor(self.executor, self.fn, [item for item, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._drain_task = None
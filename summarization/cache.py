@@ -0,0 +1,265 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """
+    A content-addressed cache for JSON-serializable results.
+
+    Entries live in an in-memory LRU tier and, optionally, in an on-disk SQLite tier
+    that survives restarts. Every entry carries its own expiry time.
+    """
+
+    def __init__(self, max_entries=1024, ttl=86400, disk_path=None, disk_max_entries=10000):
+        """
+        Initializes the cache.
+
+        Args:
+            max_entries (int): Maximum number of entries kept in memory.
+            ttl (float): Default time to live of an entry, in seconds.
+            disk_path (str, optional): Path of the SQLite file for the on-disk tier.
+                                       If None, only the memory tier is used.
+            disk_max_entries (int): Maximum number of entries kept on disk.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_max_entries = disk_max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+
+        self._db = None
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(*parts):
+        """
+        Builds a cache key from a hash of the given parts.
+
+        Args:
+            *parts: JSON-serializable values, e.g. the model name and the prompt inputs.
+
+        Returns:
+            str: The hex digest identifying the parts.
+        """
+        payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Looks up a key, first in memory and then on disk.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            The cached value, or None if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["memory_hits"] += 1
+                    return json.loads(value)
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._db.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self._store_in_memory(key, row[0], row[1])
+                    self._counters["hits"] += 1
+                    self._counters["disk_hits"] += 1
+                    return json.loads(row[0])
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores a value under a key in every tier.
+
+        Args:
+            key (str): The cache key.
+            value: A JSON-serializable value.
+            ttl (float, optional): Time to live in seconds. Defaults to the cache's ttl.
+        """
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        # Values are stored serialized so callers can never mutate a cached entry
+        serialized = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._store_in_memory(key, serialized, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, serialized, expires_at, now),
+                )
+                self._prune_disk(now)
+                self._db.commit()
+
+    def _store_in_memory(self, key, serialized, expires_at):
+        self._memory[key] = (serialized, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _prune_disk(self, now):
+        self._db.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        self._db.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.disk_max_entries,),
+        )
+
+    def clear(self):
+        """
+        Removes every entry from both tiers. The counters are kept.
+        """
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def stats(self):
+        """
+        Returns the hit/miss counters and the current size of each tier.
+
+        Returns:
+            dict: Counters plus "memory_entries" and "disk_entries".
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = (
+                self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0] if self._db is not None else 0
+            )
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+            return stats
+
+
+class ScrapeCache:
+    """
+    A cache of fetched search pages and the articles parsed from them, keyed by
+    normalized company name.
+
+    An entry is fresh for `fresh_seconds`; after that it may still be served for up
+    to `stale_seconds` while it is revalidated in the background. The HTTP validators
+    (ETag / Last-Modified) are kept so revalidation can be a conditional request.
+    """
+
+    def __init__(self, fresh_seconds=300, stale_seconds=3600, max_entries=512):
+        """
+        Initializes the cache.
+
+        Args:
+            fresh_seconds (float): How long an entry is served without revalidation.
+            stale_seconds (float): How long past its freshness an entry may still be served.
+            max_entries (int): Maximum number of companies kept.
+        """
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._counters = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "revalidated": 0}
+
+    @staticmethod
+    def normalize_key(company_name):
+        return " ".join(company_name.lower().split())
+
+    def lookup(self, key):
+        """
+        Looks up an entry and classifies its age.
+
+        Args:
+            key (str): The normalized company name.
+
+        Returns:
+            tuple: (entry, state) where state is "fresh", "stale" or "miss". An expired
+                   entry is still returned with state "miss" so its validators can be used.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None, "miss"
+            self._entries.move_to_end(key)
+            age = time.time() - entry["fetched_at"]
+            if age <= self.fresh_seconds:
+                self._counters["fresh_hits"] += 1
+                return entry, "fresh"
+            if age <= self.fresh_seconds + self.stale_seconds:
+                self._counters["stale_hits"] += 1
+                return entry, "stale"
+            self._counters["misses"] += 1
+            return entry, "miss"
+
+    def store(self, key, articles, etag=None, last_modified=None):
+        """
+        Stores freshly parsed articles along with the response validators.
+        """
+        with self._lock:
+            self._entries[key] = {
+                "articles": articles,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": time.time(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, key):
+        """
+        Marks an entry as fresh again after the server confirmed it is unchanged.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["fetched_at"] = time.time()
+                self._counters["revalidated"] += 1
+
+    def begin_refresh(self, key):
+        """
+        Claims the background refresh of a key.
+
+        Returns:
+            bool: True if the caller should refresh, False if a refresh is already running.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+            return stats
@@ -0,0 +1,367 @@
+import asyncio
+import contextvars
+import datetime
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote_plus, urlsplit
+
+import httpx
+from lxml import etree, html as lxml_html
+
+from summarization.metrics import span
+from summarization.response import NYTimesScraper, scrape_cache, session
+
+# Built-in RSS sources that can be named in NEWS_SOURCES; "{query}" is the company name
+RSS_FEEDS = {
+    "google_news": ("Google News", "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"),
+    "bing_news": ("Bing News", "https://www.bing.com/news/search?q={query}&format=rss"),
+}
+
+
+class HostRateLimiter:
+    """
+    A token bucket per host: up to `burst` requests at once, then `rate_per_second`.
+    Shared by the sync and async collectors, which sleep for the delay it hands out.
+    """
+
+    def __init__(self, rate_per_second=2.0, burst=4):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._buckets = {}  # host -> (tokens, last update)
+        self._lock = threading.Lock()
+
+    def reserve(self, host):
+        """
+        Takes a token for the host.
+
+        Returns:
+            float: Seconds to wait before sending the request.
+        """
+        if not self.rate_per_second:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate_per_second) - 1
+            self._buckets[host] = (tokens, now)
+        # A negative balance is a reservation on tokens that have not been refilled yet
+        return max(0.0, -tokens / self.rate_per_second)
+
+    def wait(self, host):
+        time.sleep(self.reserve(host))
+
+    async def wait_async(self, host):
+        await asyncio.sleep(self.reserve(host))
+
+
+class NYTimesSource:
+    """
+    The New York Times search. The first page is the regular search; each further page
+    searches the previous `window_days` window, going back in time.
+    """
+
+    name = "The New York Times"
+    host = "www.nytimes.com"
+
+    def __init__(self, pages=1, window_days=30, cache=scrape_cache):
+        self.page_count = max(1, pages)
+        self.window_days = window_days
+        self.cache = cache
+
+    def pages(self, company_name):
+        today = datetime.date.today()
+        window = datetime.timedelta(days=self.window_days)
+        one_day = datetime.timedelta(days=1)
+        # Page n covers the n-th most recent window, as (start, end) with both days included
+        return [None] + [
+            (today - window * page + one_day, today - window * (page - 1))
+            for page in range(1, self.page_count)
+        ]
+
+    def fetch(self, company_name, page, throttle=None):
+        # The scraper only throttles when it has to go to the network, not for cache hits
+        return NYTimesScraper(company_name, cache=self.cache, date_range=page).get_articles(throttle=throttle)
+
+    async def fetch_async(self, company_name, page, client=None, executor=None, throttle=None):
+        scraper = NYTimesScraper(company_name, cache=self.cache, date_range=page)
+        return await scraper.get_articles_async(client=client, executor=executor, throttle=throttle)
+
+
+class RSSSource:
+    """
+    A news search that answers with an RSS feed, normalized to the scraper's article dictionaries.
+    """
+
+    def __init__(self, name, url_template, timeout=15):
+        """
+        Args:
+            name (str): Name reported as the article source when an item names none.
+            url_template (str): Feed URL with a "{query}" placeholder for the company name.
+            timeout (float): Request timeout in seconds.
+        """
+        self.name = name
+        self.url_template = url_template
+        self.timeout = timeout
+        self.host = urlsplit(url_template).netloc
+
+    def pages(self, company_name):
+        return [None]
+
+    def get_feed_url(self, company_name):
+        return self.url_template.format(query=quote_plus(company_name))
+
+    @staticmethod
+    def _text(item, *tags):
+        for tag in tags:
+            element = item.find(tag)
+            if element is not None and element.text and element.text.strip():
+                return element.text.strip()
+        return None
+
+    def parse_feed(self, content):
+        """
+        Extracts the articles of an RSS feed.
+
+        Args:
+            content (bytes): The feed document.
+
+        Returns:
+            list: A list of dictionaries with the same keys as `NYTimesScraper.extract_article_info`.
+        """
+        parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+        root = etree.fromstring(content, parser=parser)
+        if root is None:
+            return []
+
+        articles = []
+        for item in root.iter("item"):
+            title = self._text(item, "title")
+            if not title:
+                continue
+            summary = self._text(item, "description")
+            if summary and "<" in summary:
+                # Feeds often wrap the summary in HTML
+                summary = " ".join(lxml_html.fromstring(summary).text_content().split()) or None
+            articles.append({
+                'link': self._text(item, "link"),
+                'title': title,
+                'source': self._text(item, "source") or self.name,
+                'author': self._text(item, "{http://purl.org/dc/elements/1.1/}creator", "author"),
+                'timestamp': self._text(item, "pubDate"),
+                'summary': summary
+            })
+        return articles
+
+    def fetch(self, company_name, page, throttle=None):
+        if throttle is not None:
+            throttle()
+        with span("rss_feed"):
+            response = session.get(self.get_feed_url(company_name), timeout=self.timeout)
+            response.raise_for_status()
+        return self.parse_feed(response.content)
+
+    async def fetch_async(self, company_name, page, client=None, executor=None, throttle=None):
+        if throttle is not None:
+            await throttle()
+        with span("rss_feed"):
+            if client is None:
+                async with httpx.AsyncClient(follow_redirects=True) as temp_client:
+                    response = await temp_client.get(self.get_feed_url(company_name), timeout=self.timeout)
+            else:
+                response = await client.get(self.get_feed_url(company_name), timeout=self.timeout)
+            response.raise_for_status()
+        return await asyncio.get_running_loop().run_in_executor(executor, self.parse_feed, response.content)
+
+
+class ArticleCollector:
+    """
+    Fetches every page of every configured source concurrently and merges the results,
+    dropping articles already seen under the same link or title.
+    """
+
+    def __init__(self, sources, rate_limiter=None, max_concurrency=8, max_articles=None):
+        """
+        Args:
+            sources (list): Sources with `name`, `host`, `pages(company)`, `fetch(company, page,
+                            throttle)` and `fetch_async(company, page, client, executor,
+                            throttle)`. A source calls (or awaits) `throttle()` right before
+                            each network request, so cached pages are not rate limited.
+            rate_limiter (HostRateLimiter, optional): Limits requests per host. Defaults to no limit.
+            max_concurrency (int): Maximum number of pages fetched at once.
+            max_articles (int, optional): Stop once this many distinct articles were collected.
+        """
+        self.sources = sources
+        self.rate_limiter = rate_limiter or HostRateLimiter(rate_per_second=0)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_articles = max_articles
+
+    def _pages(self, company_name):
+        return [(source, page) for source in self.sources for page in source.pages(company_name)]
+
+    @staticmethod
+    def _article_keys(article):
+        keys = []
+        if article.get("link"):
+            keys.append(("link", article["link"].split("?")[0].rstrip("/")))
+        if article.get("title"):
+            keys.append(("title", " ".join(article["title"].lower().split())))
+        return keys
+
+    def _new_articles(self, articles, seen):
+        # Keeps the articles not seen before, up to max_articles in total
+        fresh = []
+        for article in articles:
+            if self.max_articles is not None and seen["count"] >= self.max_articles:
+                break
+            keys = self._article_keys(article)
+            if any(key in seen["keys"] for key in keys):
+                continue
+            seen["keys"].update(keys)
+            seen["count"] += 1
+            fresh.append(article)
+        return fresh
+
+    def _fetch(self, source, company_name, page):
+        try:
+            return source.fetch(company_name, page, throttle=lambda: self.rate_limiter.wait(source.host))
+        except Exception as e:
+            print(f"Error collecting articles from {source.name}: {e}")
+            return []
+
+    async def _fetch_async(self, semaphore, source, company_name, page, client, executor):
+        async with semaphore:
+            try:
+                return await source.fetch_async(company_name, page, client=client, executor=executor,
+                                                 throttle=lambda: self.rate_limiter.wait_async(source.host))
+            except Exception as e:
+                print(f"Error collecting articles from {source.name}: {e}")
+                return []
+
+    def _iter_pages_sync(self, company_name):
+        pages = self._pages(company_name)
+        # Worker threads run in copies of the caller's context, so fetches are traced with the report
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(pages)) or 1) as executor:
+            futures = {
+                executor.submit(context.copy().run, self._fetch, source, company_name, page): (index, source)
+                for index, (source, page) in enumerate(pages)
+            }
+            for future in as_completed(futures):
+                index, source = futures[future]
+                yield index, source, future.result()
+
+    async def _iter_pages(self, company_name, client, executor):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(index, source, page):
+            return index, source, await self._fetch_async(semaphore, source, company_name, page, client, executor)
+
+        tasks = [asyncio.ensure_future(fetch(index, source, page))
+                 for index, (source, page) in enumerate(self._pages(company_name))]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def iter_articles_sync(self, company_name):
+        """
+        Yields the articles of each page as soon as it arrives.
+
+        Yields:
+            tuple: (source name, list of article dictionaries not yielded before)
+        """
+        seen = {"keys": set(), "count": 0}
+        for _, source, articles in self._iter_pages_sync(company_name):
+            fresh = self._new_articles(articles, seen)
+            if fresh:
+                yield source.name, fresh
+
+    async def iter_articles(self, company_name, client=None, executor=None):
+        """
+        Async counterpart of `iter_articles_sync`. Pages share `client`, or one client
+        created for the collection, so they reuse its connection pool.
+
+        Yields:
+            tuple: (source name, list of article dictionaries not yielded before)
+        """
+        if client is None:
+            async with httpx.AsyncClient(follow_redirects=True) as temp_client:
+                async for batch in self.iter_articles(company_name, temp_client, executor):
+                    yield batch
+            return
+
+        seen = {"keys": set(), "count": 0}
+        async for _, source, articles in self._iter_pages(company_name, client, executor):
+            fresh = self._new_articles(articles, seen)
+            if fresh:
+                yield source.name, fresh
+
+    def _merge(self, indexed_pages):
+        # Merge in source and page order, so the result does not depend on arrival order
+        seen = {"keys": set(), "count": 0}
+        articles = []
+        for _, page_articles in sorted(indexed_pages, key=lambda entry: entry[0]):
+            articles.extend(self._new_articles(page_articles, seen))
+        return articles
+
+    def collect_sync(self, company_name):
+        """
+        Returns the distinct articles of every page, in source and page order.
+
+        Returns:
+            list: A list of dictionaries containing article information.
+        """
+        return self._merge([(index, articles) for index, _, articles in self._iter_pages_sync(company_name)])
+
+    async def collect(self, company_name, client=None, executor=None):
+        """
+        Async counterpart of `collect_sync`.
+        """
+        if client is None:
+            async with httpx.AsyncClient(follow_redirects=True) as temp_client:
+                return await self.collect(company_name, temp_client, executor)
+        return self._merge([
+            (index, articles) async for index, _, articles in self._iter_pages(company_name, client, executor)
+        ])
+
+
+def collector_from_env():
+    """
+    Builds the collector configured by NEWS_SOURCES (comma-separated: "nytimes" and the
+    names in RSS_FEEDS), NEWS_RSS_FEEDS ("Name|url;Name|url" with a "{query}" placeholder),
+    NYTIMES_SEARCH_PAGES, NYTIMES_PAGE_WINDOW_DAYS, COLLECTOR_RATE_PER_HOST,
+    COLLECTOR_BURST_PER_HOST, COLLECTOR_MAX_CONCURRENCY and COLLECTOR_MAX_ARTICLES.
+    """
+    sources = []
+    for name in [name.strip() for name in os.getenv("NEWS_SOURCES", "nytimes").split(",") if name.strip()]:
+        if name == "nytimes":
+            sources.append(NYTimesSource(
+                pages=int(os.getenv("NYTIMES_SEARCH_PAGES", "1")),
+                window_days=int(os.getenv("NYTIMES_PAGE_WINDOW_DAYS", "30")),
+            ))
+        elif name in RSS_FEEDS:
+            sources.append(RSSSource(*RSS_FEEDS[name]))
+        else:
+            print(f"Unknown news source: {name}")
+    for feed in [feed.strip() for feed in os.getenv("NEWS_RSS_FEEDS", "").split(";") if feed.strip()]:
+        name, _, url_template = feed.partition("|")
+        sources.append(RSSSource(name.strip(), url_template.strip()))
+
+    max_articles = int(os.getenv("COLLECTOR_MAX_ARTICLES", "0"))
+    return ArticleCollector(
+        sources,
+        rate_limiter=HostRateLimiter(
+            rate_per_second=float(os.getenv("COLLECTOR_RATE_PER_HOST", "2")),
+            burst=int(os.getenv("COLLECTOR_BURST_PER_HOST", "4")),
+        ),
+        max_concurrency=int(os.getenv("COLLECTOR_MAX_CONCURRENCY", "8")),
+        max_articles=max_articles or None,
+    )
+
+
+# Shared by every report so the per-host rate limits hold across reports
+article_collector = collector_from_env()
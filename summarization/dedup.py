@@ -0,0 +1,133 @@
+import os
+import re
+import zlib
+
+import numpy as np
+
+# Mersenne prime for the MinHash permutations; a * x + b stays below 2**63 for 32-bit x
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+class NearDuplicateDetector:
+    """
+    Finds near-duplicate articles (syndicated copies, updated versions of a story) with
+    MinHash signatures over word shingles of the title and summary, and locality
+    sensitive hashing so that only articles sharing a signature band are compared.
+    The cost grows with the number of articles, not the number of pairs.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, shingle_size=3, seed=1):
+        """
+        Args:
+            threshold (float): Estimated Jaccard similarity of the shingle sets at or
+                               above which two articles are duplicates.
+            num_perm (int): Number of MinHash permutations (signature length).
+            shingle_size (int): Number of consecutive words per shingle.
+            seed (int): Seed of the permutations, so signatures are reproducible.
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self.bands, self.rows = self._band_layout(threshold, num_perm)
+
+    @staticmethod
+    def _band_layout(threshold, num_perm):
+        # Pick bands * rows = num_perm whose S-curve midpoint (1/bands)^(1/rows) is closest to the threshold
+        layouts = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+        return min(layouts, key=lambda layout: abs((1 / layout[0]) ** (1 / layout[1]) - threshold))
+
+    @staticmethod
+    def article_text(article):
+        return f"{article.get('title') or ''} {article.get('summary') or ''}"
+
+    def shingles(self, text):
+        words = re.findall(r"\w+", text.lower())
+        if len(words) <= self.shingle_size:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text):
+        """
+        Returns the MinHash signature of a text, or None if it has no words.
+        """
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.int64, count=len(shingles))
+        hashes %= MERSENNE_PRIME
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % MERSENNE_PRIME).min(axis=1)
+
+    def clusters(self, texts):
+        """
+        Groups near-duplicate texts.
+
+        Args:
+            texts (list): The texts to compare.
+
+        Returns:
+            list: For every text, the index of its cluster's first text (itself if it is unique).
+        """
+        parent = list(range(len(texts)))
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        signatures = [self.signature(text) for text in texts]
+        for band in range(self.bands):
+            buckets = {}
+            start = band * self.rows
+            for index, signature in enumerate(signatures):
+                if signature is not None:
+                    buckets.setdefault(signature[start:start + self.rows].tobytes(), []).append(index)
+            for members in buckets.values():
+                # Compare against the bucket's first member only, to stay linear in the bucket size
+                first = members[0]
+                for other in members[1:]:
+                    if np.mean(signatures[first] == signatures[other]) >= self.threshold:
+                        root_first, root_other = find(first), find(other)
+                        # The lower index, i.e. the earlier search result, stays the canonical one
+                        parent[max(root_first, root_other)] = min(root_first, root_other)
+
+        return [find(index) for index in range(len(texts))]
+
+    def deduplicate(self, articles):
+        """
+        Keeps the first article of every group of near-duplicates, in input order.
+
+        Args:
+            articles (list): A list of dictionaries containing article details.
+
+        Returns:
+            tuple: (articles kept, number of articles collapsed into an earlier one)
+        """
+        if len(articles) < 2:
+            return list(articles), 0
+        roots = self.clusters([self.article_text(article) for article in articles])
+        kept = [article for index, article in enumerate(articles) if roots[index] == index]
+        return kept, len(articles) - len(kept)
+
+
+# DEDUP_THRESHOLD=0 turns deduplication off
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+near_duplicate_detector = NearDuplicateDetector(
+    threshold=DEDUP_THRESHOLD or 1.0,
+    num_perm=int(os.getenv("DEDUP_NUM_PERM", "64")),
+)
+
+
+def deduplicate_articles(articles):
+    """
+    Collapses near-duplicate articles with the shared detector, unless disabled.
+
+    Returns:
+        tuple: (articles kept, number of articles collapsed)
+    """
+    if not DEDUP_THRESHOLD:
+        return list(articles), 0
+    return near_duplicate_detector.deduplicate(articles)
@@ -0,0 +1,377 @@
+import datetime
+import email.utils
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from summarization.cache import ScrapeCache
+
+# Strftime formats of the periods `sentiment_over_time` can group by
+PERIOD_FORMATS = {"day": "%Y-%m-%d", "week": "%Y-W%W", "month": "%Y-%m"}
+
+MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+# "Jan. 2, 2025", "March 3, 2025", "Sept. 5" (the current year is left out for recent articles)
+MONTH_DAY_PATTERN = re.compile(r"^([A-Za-z]+)\.?\s+(\d{1,2})(?:,\s*(\d{4}))?$")
+# "5h ago", "30m ago"
+RELATIVE_PATTERN = re.compile(r"^(\d+)\s*([mhd])\w*\s+ago$", re.I)
+RELATIVE_SECONDS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def parse_published_at(timestamp, seen_at=None):
+    """
+    Parses the publication time of an article from its scraped timestamp: NYTimes
+    dates such as "Jan. 2, 2025" or "5h ago", RSS dates (RFC 822) or ISO 8601 dates.
+
+    Args:
+        timestamp (str): The article's 'timestamp'.
+        seen_at (float, optional): Unix time the article was scraped at, for relative
+                                   and year-less timestamps. Defaults to now.
+
+    Returns:
+        float or None: Unix time of the publication (midnight UTC for plain dates), or
+                       None if the timestamp cannot be parsed.
+    """
+    if not timestamp or not isinstance(timestamp, str):
+        return None
+    text = " ".join(timestamp.split())
+    seen_at = time.time() if seen_at is None else seen_at
+
+    relative = RELATIVE_PATTERN.match(text)
+    if relative:
+        return seen_at - int(relative.group(1)) * RELATIVE_SECONDS[relative.group(2).lower()]
+
+    match = MONTH_DAY_PATTERN.match(text)
+    if match and match.group(1)[:3].lower() in MONTHS:
+        seen_date = datetime.datetime.fromtimestamp(seen_at, datetime.timezone.utc)
+        year = int(match.group(3)) if match.group(3) else seen_date.year
+        try:
+            published = datetime.datetime(year, MONTHS[match.group(1)[:3].lower()], int(match.group(2)),
+                                          tzinfo=datetime.timezone.utc)
+        except ValueError:
+            return None
+        if not match.group(3) and published > seen_date:
+            # A year-less date later than the scrape belongs to last year
+            published = published.replace(year=year - 1)
+        return published.timestamp()
+
+    try:
+        published = email.utils.parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        try:
+            published = datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=datetime.timezone.utc)
+    return published.timestamp()
+
+
+class ReportHistory:
+    """
+    A SQLite store of every article seen per company, with its sentiment and topic
+    results, the Gemini comparisons made between articles and a snapshot of every
+    report.
+
+    Articles are keyed by link (or title when there is none), so a new report only has
+    to analyze the articles it has not seen before, and history queries are answered
+    from the store without recomputing anything.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes the store. The SQLite file is only opened, and created if needed,
+        on first use.
+
+        Args:
+            path (str): Path of the SQLite file, or ":memory:".
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._counters = {"stored_hits": 0, "new_articles": 0, "comparison_hits": 0}
+
+    @property
+    def _db(self):
+        # Always called with the lock held
+        if self._connection is None:
+            self._connection = self._connect()
+        return self._connection
+
+    def _connect(self):
+        directory = os.path.dirname(self.path) if self.path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.executescript(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "company TEXT NOT NULL, article_key TEXT NOT NULL, link TEXT, title TEXT, summary TEXT, "
+            "source TEXT, author TEXT, timestamp TEXT, sentiment TEXT, sentiment_score REAL, topics TEXT, "
+            "published_at REAL, first_seen REAL NOT NULL, last_seen REAL NOT NULL, "
+            "PRIMARY KEY (company, article_key));"
+            "CREATE TABLE IF NOT EXISTS comparisons ("
+            "first_key TEXT NOT NULL, second_key TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (first_key, second_key));"
+            "CREATE TABLE IF NOT EXISTS reports ("
+            "company TEXT NOT NULL, created_at REAL NOT NULL, articles INTEGER NOT NULL, "
+            "new_articles INTEGER NOT NULL, average_sentiment_score REAL, final_sentiment TEXT);"
+            "CREATE INDEX IF NOT EXISTS reports_created_at ON reports (company, created_at);"
+        )
+        # Stores created before publication times were kept gain the column
+        columns = {row[1] for row in db.execute("PRAGMA table_info(articles)")}
+        if "published_at" not in columns:
+            db.execute("ALTER TABLE articles ADD COLUMN published_at REAL")
+        db.execute("CREATE INDEX IF NOT EXISTS articles_published_at ON articles "
+                   "(company, COALESCE(published_at, first_seen))")
+        db.commit()
+        return db
+
+    @staticmethod
+    def article_key(article):
+        """
+        Returns the key an article is stored under: its link without query string, or
+        its normalized title if it has no link.
+        """
+        if article.get("link"):
+            return article["link"].split("?")[0].rstrip("/")
+        return "title:" + " ".join((article.get("title") or "").lower().split())
+
+    @classmethod
+    def comparison_key(cls, article):
+        """
+        Returns the key an article is stored under in comparisons: its article key plus
+        a digest of its summary, so a comparison is not reused once the summary changes.
+        """
+        digest = hashlib.sha256((article.get("summary") or "").encode("utf-8")).hexdigest()[:16]
+        return f"{cls.article_key(article)}#{digest}"
+
+    def lookup(self, company_name, articles):
+        """
+        Finds the stored analysis of each article. An article whose summary changed
+        since it was stored counts as new.
+
+        Args:
+            company_name (str): The company the articles were collected for.
+            articles (list): The articles of the current report.
+
+        Returns:
+            list: For every article, the stored article with 'sentiment', 'sentiment_score'
+                  and 'topics', or None if it has to be analyzed.
+        """
+        company = ScrapeCache.normalize_key(company_name)
+        keys = [self.article_key(article) for article in articles]
+        rows = {}
+        with self._lock:
+            # Stay well below SQLite's limit on bound parameters
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for key, summary, sentiment, score, topics in self._db.execute(
+                        "SELECT article_key, summary, sentiment, sentiment_score, topics FROM articles "
+                        f"WHERE company = ? AND article_key IN ({placeholders})", [company, *chunk]):
+                    rows[key] = (summary, sentiment, score, topics)
+
+            stored = []
+            for article, key in zip(articles, keys):
+                row = rows.get(key)
+                if row is None or row[0] != article.get("summary"):
+                    stored.append(None)
+                    continue
+                analysis = {**article, "sentiment": row[1], "sentiment_score": row[2]}
+                if row[3] is not None:
+                    analysis["topics"] = json.loads(row[3])
+                stored.append(analysis)
+            hits = sum(analysis is not None for analysis in stored)
+            self._counters["stored_hits"] += hits
+            self._counters["new_articles"] += len(stored) - hits
+        return stored
+
+    def store_articles(self, company_name, articles):
+        """
+        Inserts or updates analyzed articles. The time an article was first seen is kept.
+
+        Args:
+            company_name (str): The company the articles were collected for.
+            articles (list): Articles with 'sentiment', 'sentiment_score' and optionally 'topics'.
+        """
+        company = ScrapeCache.normalize_key(company_name)
+        now = time.time()
+        rows = [
+            (company, self.article_key(article), article.get("link"), article.get("title"),
+             article.get("summary"), article.get("source"), article.get("author"), article.get("timestamp"),
+             article.get("sentiment"), article.get("sentiment_score"),
+             json.dumps(article["topics"]) if "topics" in article else None,
+             parse_published_at(article.get("timestamp"), now), now, now)
+            for article in articles
+        ]
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO articles (company, article_key, link, title, summary, source, author, timestamp, "
+                "sentiment, sentiment_score, topics, published_at, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (company, article_key) DO UPDATE SET "
+                "link = excluded.link, title = excluded.title, summary = excluded.summary, "
+                "source = excluded.source, author = excluded.author, timestamp = excluded.timestamp, "
+                "sentiment = excluded.sentiment, sentiment_score = excluded.sentiment_score, "
+                "topics = excluded.topics, "
+                # A relative timestamp ("5h ago") is most precise the first time it is seen
+                "published_at = COALESCE(articles.published_at, excluded.published_at), "
+                "last_seen = excluded.last_seen",
+                rows,
+            )
+            self._db.commit()
+
+    def get_comparison(self, article1, article2):
+        """
+        Returns the stored Gemini comparison of two articles, or None if there is none
+        for their current summaries.
+        """
+        return self.get_comparisons([(article1, article2)])[0]
+
+    def get_comparisons(self, article_pairs):
+        """
+        Looks up the stored Gemini comparisons of several article pairs.
+
+        Args:
+            article_pairs (list): (article1, article2) tuples.
+
+        Returns:
+            list: The stored comparison of every pair, or None where there is none, in input order.
+        """
+        keys = [(self.comparison_key(article1), self.comparison_key(article2)) for article1, article2 in article_pairs]
+        results = []
+        with self._lock:
+            for key in keys:
+                row = self._db.execute(
+                    "SELECT result FROM comparisons WHERE first_key = ? AND second_key = ?", key
+                ).fetchone()
+                results.append(json.loads(row[0]) if row is not None else None)
+            self._counters["comparison_hits"] += sum(result is not None for result in results)
+        return results
+
+    def store_comparison(self, article1, article2, result):
+        """
+        Stores the Gemini comparison of two articles.
+        """
+        self.store_comparisons([(article1, article2, result)])
+
+    def store_comparisons(self, comparisons):
+        """
+        Stores several Gemini comparisons in one transaction.
+
+        Args:
+            comparisons (list): (article1, article2, result) tuples.
+        """
+        now = time.time()
+        rows = [
+            (self.comparison_key(article1), self.comparison_key(article2), json.dumps(result), now)
+            for article1, article2, result in comparisons
+        ]
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO comparisons (first_key, second_key, result, created_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._db.commit()
+
+    def record_report(self, company_name, articles, new_articles, final_sentiment):
+        """
+        Stores a snapshot of a finished report.
+
+        Args:
+            company_name (str): The company reported on.
+            articles (list): The analyzed articles of the report.
+            new_articles (int): How many of them were analyzed for this report.
+            final_sentiment (str): The report's final sentiment analysis.
+        """
+        scores = [article["sentiment_score"] for article in articles if article.get("sentiment_score") is not None]
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO reports (company, created_at, articles, new_articles, average_sentiment_score, "
+                "final_sentiment) VALUES (?, ?, ?, ?, ?, ?)",
+                (ScrapeCache.normalize_key(company_name), time.time(), len(articles), new_articles,
+                 sum(scores) / len(scores) if scores else None, final_sentiment),
+            )
+            self._db.commit()
+
+    def sentiment_over_time(self, company_name, period="day", since=None):
+        """
+        Aggregates the stored articles of a company by the period they were published in.
+        Articles whose timestamp could not be parsed count in the period they were first
+        seen in.
+
+        Args:
+            company_name (str): The company to query.
+            period (str): "day", "week" or "month".
+            since (float, optional): Only count articles published at or after this Unix time.
+
+        Returns:
+            list: One dict per period, oldest first, with "Period", "Articles",
+                  "Average Sentiment Score" and the "Positive"/"Negative"/"Neutral" counts.
+
+        Raises:
+            ValueError: If the period is not supported.
+        """
+        if period not in PERIOD_FORMATS:
+            raise ValueError(f"Unsupported period '{period}', expected one of: {', '.join(PERIOD_FORMATS)}")
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT strftime(?, COALESCE(published_at, first_seen), 'unixepoch') AS period, COUNT(*), "
+                "AVG(sentiment_score), SUM(sentiment = 'positive'), SUM(sentiment = 'negative'), "
+                "SUM(sentiment = 'neutral') FROM articles "
+                "WHERE company = ? AND COALESCE(published_at, first_seen) >= ? GROUP BY period ORDER BY period",
+                (PERIOD_FORMATS[period], ScrapeCache.normalize_key(company_name), since or 0),
+            ).fetchall()
+        return [
+            {
+                "Period": period_label,
+                "Articles": count,
+                "Average Sentiment Score": round(average, 4) if average is not None else None,
+                "Positive": positive,
+                "Negative": negative,
+                "Neutral": neutral,
+            }
+            for period_label, count, average, positive, negative, neutral in rows
+        ]
+
+    def report_history(self, company_name, limit=100):
+        """
+        Returns the most recent report snapshots of a company, newest first.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT created_at, articles, new_articles, average_sentiment_score, final_sentiment "
+                "FROM reports WHERE company = ? ORDER BY created_at DESC LIMIT ?",
+                (ScrapeCache.normalize_key(company_name), limit),
+            ).fetchall()
+        return [
+            {
+                "Created At": created_at,
+                "Articles": articles,
+                "New Articles": new_articles,
+                "Average Sentiment Score": average,
+                "Final Sentiment Analysis": final_sentiment,
+            }
+            for created_at, articles, new_articles, average, final_sentiment in rows
+        ]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["articles"] = self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            stats["comparisons"] = self._db.execute("SELECT COUNT(*) FROM comparisons").fetchone()[0]
+            stats["reports"] = self._db.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+            return stats
+
+
+# Kept with the project rather than in the working directory of whoever imports it
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    "data", "report_history.db")
+
+# REPORT_HISTORY_PATH= (empty) turns the store off; every report is then computed from scratch
+REPORT_HISTORY_PATH = os.getenv("REPORT_HISTORY_PATH", DEFAULT_HISTORY_PATH)
+report_history = ReportHistory(REPORT_HISTORY_PATH) if REPORT_HISTORY_PATH else None
@@ -1,42 +1,205 @@
+import asyncio
+import contextvars
 import json
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from google import genai
+from summarization.cache import ResponseCache
+from summarization.metrics import span
+from summarization.pair_selection import pair_selector_from_env
 
 load_dotenv()
 gemini_api_key = os.getenv("GEMINI_API_KEY")
 
+GEMINI_MODEL = "gemini-2.0-flash"  # Using the faster Flash model
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "5"))
+DEFAULT_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "30"))
+DEFAULT_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+DEFAULT_BATCHED = os.getenv("GEMINI_BATCHED_ANALYSIS", "false").lower() in ("1", "true", "yes")
+
+# Shared across every CoverageComparison so repeat reports reuse earlier Gemini answers
+llm_cache = ResponseCache(
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048")),
+    ttl=float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+    disk_path=os.getenv("LLM_CACHE_PATH") or None,
+    disk_max_entries=int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", "50000")),
+)
+
+# Final sentiment of a report without any comparison, returned without calling Gemini
+NO_COMPARISONS_ANALYSIS = {"Final Sentiment Analysis": "Not enough articles to compare coverage."}
+
+# Decides which article pairs are compared; None keeps the sequential (1,2), (3,4), ... pairs
+DEFAULT_PAIR_SELECTOR = pair_selector_from_env()
+
 class CoverageComparison:
 
-    def __init__(self, api_key):
+    def __init__(self, api_key, max_concurrency=DEFAULT_MAX_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_base=1.0, backoff_cap=20.0,
+                 batched=DEFAULT_BATCHED, cache=llm_cache, use_cache=True,
+                 pair_selector=DEFAULT_PAIR_SELECTOR, history=None, shared_semaphore=None):
         """
         Initialize the CoverageComparison class.
-        
+
         Args:
             api_key (str, optional): Gemini API key. If not provided, will try to load from environment.
+            max_concurrency (int): Maximum number of comparisons in flight at once.
+            timeout (float): Timeout in seconds for each Gemini call.
+            max_retries (int): Number of retries when Gemini rejects a call for rate limiting.
+            backoff_base (float): Base delay in seconds of the exponential backoff.
+            backoff_cap (float): Upper bound in seconds of a single backoff delay.
+            batched (bool): If True, `get_all_analysis` sends every pair and the final
+                            sentiment request in one prompt instead of one call per pair.
+            cache (ResponseCache, optional): Cache of parsed responses, keyed on the model and prompt.
+            use_cache (bool): If False, cached responses are not read; fresh ones are still stored.
+            pair_selector (PairSelector, optional): Chooses the pairs to compare within a
+                                                    budget. If None, articles are compared
+                                                    in scrape order, (1,2), (3,4), ...
+            history (ReportHistory, optional): Store of earlier comparisons, keyed by the
+                                               articles' links, so a pair is only sent to
+                                               Gemini once. It is read by `select_pairs`
+                                               and written by `store_new_comparisons`,
+                                               never by the Gemini calls themselves.
+            shared_semaphore (asyncio.Semaphore, optional): Bounds the async Gemini calls
+                                                            in flight across every comparison
+                                                            sharing it, e.g. all companies
+                                                            of a bulk run.
         """
         self.api_key = api_key
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.batched = batched
+        self.cache = cache
+        self.use_cache = use_cache
+        self.pair_selector = pair_selector
+        self.history = history
+        self.shared_semaphore = shared_semaphore
+        # Comparisons found in the history, by pair numbers, and those made since
+        self._stored_comparisons = {}
+        self._new_comparisons = []
+        self._client = None
+        self._client_lock = threading.Lock()
 
-    def compare_two_articles(self, i, article1, article2, gemini_api_key):
+    @property
+    def client(self):
         """
-        Generates a precise one-line comparison between two articles using Google's Gemini Flash model.
-        
+        The Gemini client, created on first use and reused for every call.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from google import genai
+                    from google.genai import types
+
+                    self._client = genai.Client(
+                        api_key=self.api_key,
+                        http_options=types.HttpOptions(timeout=int(self.timeout * 1000)),
+                    )
+        return self._client
+
+    def _cache_key(self, prompt):
+        return ResponseCache.make_key(GEMINI_MODEL, prompt)
+
+    def _cache_get(self, key):
+        if self.cache is None or not self.use_cache:
+            return None
+        return self.cache.get(key)
+
+    def _load_stored_comparisons(self, pairs):
+        if self.history is None or not self.use_cache or not pairs:
+            return
+        stored = self.history.get_comparisons([(article1, article2) for _, article1, article2, _ in pairs])
+        for (i, _, _, j), comparison in zip(pairs, stored):
+            if comparison is not None:
+                self._stored_comparisons[(i, j)] = comparison
+
+    def store_new_comparisons(self):
+        """
+        Writes the comparisons Gemini made since the last call to the history. This is
+        disk I/O, so the report pipeline calls it from its history stage in an executor.
+        """
+        comparisons, self._new_comparisons = self._new_comparisons, []
+        if self.history is not None and comparisons:
+            self.history.store_comparisons(comparisons)
+
+    def _cache_set(self, key, value):
+        # Only successfully parsed responses are stored, never the error placeholders
+        if self.cache is not None:
+            self.cache.set(key, value)
+
+    @staticmethod
+    def _is_rate_limit_error(error):
+        from google.genai import errors
+
+        return isinstance(error, errors.APIError) and (
+            error.code == 429 or error.status == "RESOURCE_EXHAUSTED"
+        )
+
+    def _backoff_delay(self, attempt):
+        # Full jitter: spreads retries of concurrent calls so they don't hit the limit together
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _generate(self, prompt, call="gemini"):
+        """
+        Sends a prompt to Gemini, retrying with jittered backoff on rate-limit errors.
+
         Args:
-            article1 (dict): Dictionary with 'title' and 'summary' keys
-            article2 (dict): Dictionary with 'title' and 'summary' keys
-            gemini_api_key (str): Your Gemini API key
-        
+            prompt (str): The prompt.
+            call (str): Name the call is timed under, retries included.
+
         Returns:
-            dict: {"Comparison": "one-line", "Impact": "one-line"}
+            str: The response text.
+        """
+        with span(call):
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = self.client.models.generate_content(model=GEMINI_MODEL, contents=[prompt])
+                    return response.text
+                except Exception as e:
+                    if attempt == self.max_retries or not self._is_rate_limit_error(e):
+                        raise
+                    time.sleep(self._backoff_delay(attempt))
+
+    async def _generate_async(self, prompt, call="gemini"):
+        """
+        Async counterpart of `_generate`, with the per-call timeout enforced on the event loop.
+
+        Returns:
+            str: The response text.
         """
-        client = genai.Client(api_key=self.api_key)
-        
-        prompt = f"""Compare these articles and respond in JSON format :
+        if self.shared_semaphore is not None:
+            async with self.shared_semaphore:
+                return await self._generate_with_retries_async(prompt, call)
+        return await self._generate_with_retries_async(prompt, call)
+
+    async def _generate_with_retries_async(self, prompt, call):
+        with span(call):
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await asyncio.wait_for(
+                        self.client.aio.models.generate_content(model=GEMINI_MODEL, contents=[prompt]),
+                        timeout=self.timeout,
+                    )
+                    return response.text
+                except Exception as e:
+                    if attempt == self.max_retries or not self._is_rate_limit_error(e):
+                        raise
+                    await asyncio.sleep(self._backoff_delay(attempt))
+
+    def _build_comparison_prompt(self, i, article1, article2, j=None):
+        # Articles are labelled with their 1-based positions; the second defaults to the next one
+        j = i + 1 if j is None else j
+        return f"""Compare these articles and respond in JSON format :
 
         Article {i} - Title: {article1.get('title','')}
         Summary: {article1.get('summary','')}
 
-        Article {i+1} - Title: {article2.get('title','')}
+        Article {j} - Title: {article2.get('title','')}
         Summary: {article2.get('summary','')}
 
         Provide:
@@ -50,28 +213,155 @@ class CoverageComparison:
             "Comparison": "Your one-line comparison here",
             "Impact": "Your one-line impact here"
         }}"""
-        
-        try:
-            response = client.models.generate_content(
-                model="gemini-2.0-flash",  # Using the faster Flash model
-                contents=[prompt],
-                
-            )
-            
-            
-            # Extract the text and remove any markdown code block formatting
-            response_text = response.text.strip('`json\n').strip('`').strip()
-
-            # Parse the JSON response
-            result = json.loads(response_text) 
 
-            return {
-                "Comparison": " ".join(result["Comparison"].split()),
-                "Impact": " ".join(result["Impact"].split())
+    def _parse_comparison(self, response_text):
+        # Extract the text and remove any markdown code block formatting
+        response_text = response_text.strip('`json\n').strip('`').strip()
+
+        # Parse the JSON response
+        result = json.loads(response_text)
+
+        return {
+            "Comparison": " ".join(result["Comparison"].split()),
+            "Impact": " ".join(result["Impact"].split())
+        }
+
+    def _build_final_sentiment_prompt(self, comparisons):
+        impacts = [comp["Impact"] for comp in comparisons]
+        impacts_str = "\n".join(impacts)
+
+        return f"""Analyze the following impacts from news coverage and provide a final sentiment analysis in two lines:
+
+        {impacts_str}
+
+        Specifically address:
+        1. Whether the overall news coverage is positive or negative.
+        2. The overall impact on the company's market growth.
+
+        Respond in JSON format:
+        {{
+            "Final Sentiment Analysis": "Your two-line analysis here"
+        }}
+
+        Note: It should strictly avoid any other extra words like "JSON", etc."""
+
+    def _parse_final_sentiment(self, response_text):
+        response_text = response_text.strip('`json\n').strip('`').strip()
+        result = json.loads(response_text)
+        return {"Final Sentiment Analysis": " ".join(result["Final Sentiment Analysis"].split())}
+
+    def _build_batched_prompt(self, pairs):
+        pairs_str = "\n\n        ".join(
+            f"""Pair {n}:
+        Article {i} - Title: {article1.get('title','')}
+        Summary: {article1.get('summary','')}
+        Article {j} - Title: {article2.get('title','')}
+        Summary: {article2.get('summary','')}"""
+            for n, (i, article1, article2, j) in enumerate(pairs, 1)
+        )
+
+        return f"""Compare the two articles of each pair below, then analyze the overall coverage, and respond in JSON format :
+
+        {pairs_str}
+
+        For every pair, provide:
+        1. "Comparison": One sentence highlighting key difference
+        2. "Impact": One sentence on practical consequence
+
+        Then, based on the impacts of all pairs, provide "Final Sentiment Analysis" in two lines that addresses:
+        1. Whether the overall news coverage is positive or negative.
+        2. The overall impact on the company's market growth.
+
+        Note: It should strictly avoid any other extra words like "JSON", etc.
+
+        Format exactly like this, with one entry per pair in the same order:
+        {{
+            "Coverage Differences": [
+                {{"Pair": 1, "Comparison": "Your one-line comparison here", "Impact": "Your one-line impact here"}}
+            ],
+            "Final Sentiment Analysis": "Your two-line analysis here"
+        }}"""
+
+    def _parse_batched(self, response_text, num_pairs):
+        """
+        Splits a batched response into the same shapes `get_all_analysis` returns.
+
+        Raises:
+            ValueError: If the response is not valid JSON or has the wrong number of pairs.
+        """
+        response_text = response_text.strip('`json\n').strip('`').strip()
+        result = json.loads(response_text)
+
+        differences = result["Coverage Differences"]
+        if len(differences) != num_pairs:
+            raise ValueError(f"Expected {num_pairs} comparisons, got {len(differences)}")
+
+        # Order by the pair number when the model provides one
+        if all(isinstance(entry.get("Pair"), int) for entry in differences):
+            differences = sorted(differences, key=lambda entry: entry["Pair"])
+
+        comparison_list = [
+            {
+                "Comparison": " ".join(entry["Comparison"].split()),
+                "Impact": " ".join(entry["Impact"].split())
             }
+            for entry in differences
+        ]
+        final_sentiment = {"Final Sentiment Analysis": " ".join(result["Final Sentiment Analysis"].split())}
+        return comparison_list, final_sentiment
+
+    def _run(self, steps):
+        """
+        Drives a Gemini flow written as a generator (see `_comparison_steps`), sending
+        each prompt it yields with `_generate`.
+
+        Returns:
+            The value the flow returns.
+        """
+        try:
+            request = next(steps)
+            while True:
+                try:
+                    response_text = self._generate(*request)
+                except Exception as e:
+                    request = steps.throw(e)
+                else:
+                    request = steps.send(response_text)
+        except StopIteration as done:
+            return done.value
+
+    async def _run_async(self, steps):
+        """
+        Async counterpart of `_run`: the same flow, with each prompt sent with `_generate_async`.
+        """
+        try:
+            request = next(steps)
+            while True:
+                try:
+                    response_text = await self._generate_async(*request)
+                except Exception as e:
+                    request = steps.throw(e)
+                else:
+                    request = steps.send(response_text)
+        except StopIteration as done:
+            return done.value
+
+    def _comparison_steps(self, i, article1, article2, j=None):
+        # Yields (prompt, call) and receives the response text, or the error raised into it,
+        # so the sync and async methods share everything but the Gemini call
+        stored = self._stored_comparisons.get((i, i + 1 if j is None else j))
+        if stored is not None:
+            return stored
+        prompt = self._build_comparison_prompt(i, article1, article2, j)
+        cache_key = self._cache_key(prompt)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            result = self._parse_comparison((yield prompt, "gemini_compare"))
         except json.JSONDecodeError as je:
             print(f"JSON Parsing Error: {je}")
-            # print(f"Received response: {response.text}")
             return {
                 "Comparison": "Parsing error",
                 "Impact": "Unable to parse response"
@@ -83,87 +373,282 @@ class CoverageComparison:
                 "Impact": "Impact analysis failed"
             }
 
-    def get_analysis_across_all(self, articles):
+        self._cache_set(cache_key, result)
+        self._new_comparisons.append((article1, article2, result))
+        return result
+
+    def compare_two_articles(self, i, article1, article2, gemini_api_key, j=None):
         """
-        Generates article comparisons across all the articles in pairs.
+        Generates a precise one-line comparison between two articles using Google's Gemini Flash model.
+
         Args:
-            articles (list): List of dictionaries of articles with 'title' and 'summary' keys
+            i (int): The 1-based number of the first article in the pair.
+            article1 (dict): Dictionary with 'title' and 'summary' keys
+            article2 (dict): Dictionary with 'title' and 'summary' keys
             gemini_api_key (str): Your Gemini API key
+            j (int, optional): The 1-based number of the second article. Defaults to i + 1.
+
+        Returns:
+            dict: {"Comparison": "one-line", "Impact": "one-line"}
+        """
+        return self._run(self._comparison_steps(i, article1, article2, j))
+
+    async def compare_two_articles_async(self, i, article1, article2, j=None):
+        """
+        Async counterpart of `compare_two_articles` using the Gemini async client.
+
+        Args:
+            i (int): The 1-based number of the first article in the pair.
+            article1 (dict): Dictionary with 'title' and 'summary' keys
+            article2 (dict): Dictionary with 'title' and 'summary' keys
+            j (int, optional): The 1-based number of the second article. Defaults to i + 1.
+
+        Returns:
+            dict: {"Comparison": "one-line", "Impact": "one-line"}
+        """
+        return await self._run_async(self._comparison_steps(i, article1, article2, j))
+
+    def select_pairs(self, articles):
+        """
+        Chooses the article pairs to compare and looks up their stored comparisons in
+        the history. This is local CPU work (TF-IDF and clustering) and disk I/O, so the
+        async pipeline runs it as its own stage in an executor.
+
+        Args:
+            articles (list): List of dictionaries of articles with 'title' and 'summary' keys,
+                             and optionally 'sentiment_score'.
+
+        Returns:
+            list: (first number, first article, second article, second number) tuples,
+                  with articles numbered from 1.
+        """
+        if self.pair_selector is not None:
+            pairs = [(i + 1, articles[i], articles[j], j + 1) for i, j in self.pair_selector.select(articles)]
+        else:
+            # Pairs (1,2), (3,4), ...; with an odd number of articles the last one is left out
+            pairs = [(i + 1, articles[i], articles[i + 1], i + 2) for i in range(0, len(articles) - 1, 2)]
+        self._load_stored_comparisons(pairs)
+        return pairs
+
+    async def _select_pairs_async(self, articles, pairs):
+        # Pairs not selected by the caller are selected off the event loop
+        if pairs is not None:
+            return pairs
+        return await asyncio.get_running_loop().run_in_executor(None, self.select_pairs, articles)
+
+    def get_analysis_across_all(self, articles, pairs=None):
+        """
+        Generates article comparisons across all the articles in pairs. The pairs are
+        compared concurrently, at most `max_concurrency` at a time, and the results are
+        returned in pair order.
+
+        Args:
+            articles (list): List of dictionaries of articles with 'title' and 'summary' keys
+            pairs (list, optional): Pairs from `select_pairs`; selected here if not given.
 
         Returns:
             list: List of dictionaries, each with "Comparison" and "Impact" keys.
         """
-        comparison_list = []
-        if len(articles) < 2:
-            return comparison_list # return empty list if less than 2 articles.
-
-        for i in range(0, len(articles) - 1, 2):
-            try:
-                ans_dict = self.compare_two_articles(i + 1, articles[i], articles[i + 1], self.api_key)
-                comparison_list.append(ans_dict)
-            except IndexError: # handle the case where there is an odd number of articles.
-                print("Odd number of articles, last one will be ignored")
-                break
-            except Exception as e:
-                print(f"An unexpected error occurred: {e}")
-        return comparison_list
-    
-    def get_final_sentiment_analysis(self, comparisons):
+        if pairs is None:
+            pairs = self.select_pairs(articles)
+        if not pairs:
+            return [] # return empty list if less than 2 articles.
+
+        # Worker threads run in a copy of the caller's context, so the calls are traced with the report
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(pairs))) as executor:
+            return list(executor.map(
+                lambda pair: context.copy().run(
+                    self.compare_two_articles, pair[0], pair[1], pair[2], self.api_key, pair[3]
+                ), pairs
+            ))
+
+    async def get_analysis_across_all_async(self, articles, pairs=None):
         """
-        Generates a final sentiment analysis based on the impact of all article comparisons.
-        
+        Async counterpart of `get_analysis_across_all`.
+
         Args:
-            comparisons (list): List of dictionaries, each with "Comparison" and "Impact" keys.
-        
+            articles (list): List of dictionaries of articles with 'title' and 'summary' keys
+            pairs (list, optional): Pairs from `select_pairs`; selected here if not given.
+
         Returns:
-            dict: {"Final Sentiment Analysis": "Two-line sentiment analysis"}
+            list: List of dictionaries, each with "Comparison" and "Impact" keys.
         """
-        client = genai.Client(api_key=self.api_key)
-        
-        impacts = [comp["Impact"] for comp in comparisons]
-        impacts_str = "\n".join(impacts)
+        pairs = await self._select_pairs_async(articles, pairs)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
 
-        prompt = f"""Analyze the following impacts from news coverage and provide a final sentiment analysis in two lines:
+        async def compare(i, article1, article2, j):
+            async with semaphore:
+                return await self.compare_two_articles_async(i, article1, article2, j)
 
-        {impacts_str}
+        # gather keeps the results in pair order regardless of completion order
+        return list(await asyncio.gather(*(compare(*pair) for pair in pairs)))
 
-        Specifically address:
-        1. Whether the overall news coverage is positive or negative.
-        2. The overall impact on the company's market growth.
+    async def iter_analysis_across_all_async(self, articles, pairs=None):
+        """
+        Compares the article pairs concurrently and yields each comparison as soon as
+        Gemini returns it.
 
-        Respond in JSON format:
-        {{
-            "Final Sentiment Analysis": "Your two-line analysis here"
-        }}
+        Args:
+            articles (list): List of dictionaries of articles with 'title' and 'summary' keys
+            pairs (list, optional): Pairs from `select_pairs`; selected here if not given.
 
-        Note: It should strictly avoid any other extra words like "JSON", etc."""
+        Yields:
+            tuple: (pair_index, comparison) in completion order, where pair_index is the
+                   0-based position of the pair and comparison has "Comparison" and "Impact" keys.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def compare(pair_index, i, article1, article2, j):
+            async with semaphore:
+                return pair_index, await self.compare_two_articles_async(i, article1, article2, j)
+
+        pairs = await self._select_pairs_async(articles, pairs)
+        tasks = [compare(pair_index, *pair) for pair_index, pair in enumerate(pairs)]
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+
+    def _final_sentiment_steps(self, comparisons):
+        if not comparisons:
+            # Without impacts there is nothing for Gemini to analyze
+            return dict(NO_COMPARISONS_ANALYSIS)
+        prompt = self._build_final_sentiment_prompt(comparisons)
+        cache_key = self._cache_key(prompt)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
-            response = client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=[prompt],
-            )
-            response_text = response.text.strip('`json\n').strip('`').strip()
-            result = json.loads(response_text)
-            return {"Final Sentiment Analysis": " ".join(result["Final Sentiment Analysis"].split())}
+            result = self._parse_final_sentiment((yield prompt, "gemini_final_sentiment"))
         except json.JSONDecodeError as je:
             print(f"JSON Parsing Error: {je}")
-            # print(f"Received response: {response.text}")
             return {"Final Sentiment Analysis": "Parsing error"}
         except Exception as e:
             print(f"API Error: {e}")
             return {"Final Sentiment Analysis": "Analysis failed"}
-        
-    def get_all_analysis(self, articles):
+
+        self._cache_set(cache_key, result)
+        return result
+
+    def get_final_sentiment_analysis(self, comparisons):
+        """
+        Generates a final sentiment analysis based on the impact of all article comparisons.
+
+        Args:
+            comparisons (list): List of dictionaries, each with "Comparison" and "Impact" keys.
+
+        Returns:
+            dict: {"Final Sentiment Analysis": "Two-line sentiment analysis"}
+        """
+        return self._run(self._final_sentiment_steps(comparisons))
+
+    async def get_final_sentiment_analysis_async(self, comparisons):
+        """
+        Async counterpart of `get_final_sentiment_analysis`.
+
+        Args:
+            comparisons (list): List of dictionaries, each with "Comparison" and "Impact" keys.
+
+        Returns:
+            dict: {"Final Sentiment Analysis": "Two-line sentiment analysis"}
+        """
+        return await self._run_async(self._final_sentiment_steps(comparisons))
+
+    def get_all_analysis(self, articles, pairs=None):
         """
         Generates all comparison analysis and the final sentiment analysis.
-        
+
         Args:
-            articles (list): List of dictionaries of articles with 'title' and 'summary' keys.
-        
+            articles (list): List of dictionaries of articles with 'title' and 'summary' keys
+            pairs (list, optional): Pairs from `select_pairs`; selected here if not given.
+
         Returns:
             tuple: (comparison_list, final_sentiment)
         """
-        comparison_list = self.get_analysis_across_all(articles)
+        if self.batched:
+            return self.get_batched_analysis(articles, pairs)
+
+        comparison_list = self.get_analysis_across_all(articles, pairs)
         final_sentiment = self.get_final_sentiment_analysis(comparison_list)
-        return comparison_list, final_sentiment
\ No newline at end of file
+        return comparison_list, final_sentiment
+
+    def _batched_steps(self, pairs):
+        # Returns None when the caller should fall back to one call per pair
+        if not pairs:
+            return None
+        prompt = self._build_batched_prompt(pairs)
+        cache_key = self._cache_key(prompt)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return tuple(cached)
+        try:
+            result = self._parse_batched((yield prompt, "gemini_batched"), len(pairs))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            # json.JSONDecodeError is a ValueError
+            print(f"Batched analysis failed, falling back to per-pair calls: {e}")
+            return None
+        except Exception as e:
+            print(f"API Error: {e}, falling back to per-pair calls")
+            return None
+        self._cache_set(cache_key, result)
+        return result
+
+    def get_batched_analysis(self, articles, pairs=None):
+        """
+        Generates all comparisons and the final sentiment analysis with a single Gemini call.
+        Falls back to one call per pair if the batched response cannot be used.
+
+        Args:
+            articles (list): List of dictionaries of articles with 'title' and 'summary' keys
+            pairs (list, optional): Pairs from `select_pairs`; selected here if not given.
+
+        Returns:
+            tuple: (comparison_list, final_sentiment)
+        """
+        if pairs is None:
+            pairs = self.select_pairs(articles)
+        result = self._run(self._batched_steps(pairs))
+        if result is not None:
+            return result
+
+        comparison_list = self.get_analysis_across_all(articles, pairs)
+        final_sentiment = self.get_final_sentiment_analysis(comparison_list)
+        return comparison_list, final_sentiment
+
+    async def get_all_analysis_async(self, articles, pairs=None):
+        """
+        Async counterpart of `get_all_analysis`.
+
+        Args:
+            articles (list): List of dictionaries of articles with 'title' and 'summary' keys
+            pairs (list, optional): Pairs from `select_pairs`; selected here if not given.
+
+        Returns:
+            tuple: (comparison_list, final_sentiment)
+        """
+        if self.batched:
+            return await self.get_batched_analysis_async(articles, pairs)
+
+        comparison_list = await self.get_analysis_across_all_async(articles, pairs)
+        final_sentiment = await self.get_final_sentiment_analysis_async(comparison_list)
+        return comparison_list, final_sentiment
+
+    async def get_batched_analysis_async(self, articles, pairs=None):
+        """
+        Async counterpart of `get_batched_analysis`.
+
+        Args:
+            articles (list): List of dictionaries of articles with 'title' and 'summary' keys
+            pairs (list, optional): Pairs from `select_pairs`; selected here if not given.
+
+        Returns:
+            tuple: (comparison_list, final_sentiment)
+        """
+        pairs = await self._select_pairs_async(articles, pairs)
+        result = await self._run_async(self._batched_steps(pairs))
+        if result is not None:
+            return result
+
+        comparison_list = await self.get_analysis_across_all_async(articles, pairs)
+        final_sentiment = await self.get_final_sentiment_analysis_async(comparison_list)
+        return comparison_list, final_sentiment
@@ -0,0 +1,252 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from a cached lookup up to a slow Gemini call with retries
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value):
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class Counter:
+    """
+    A monotonically increasing count, optionally split by labels.
+    """
+
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return [
+                (f"{self.name}{_format_labels(self.labelnames, key)}", value)
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Histogram:
+    """
+    A distribution of observed values in cumulative buckets, optionally split by labels.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values = {}  # label values -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        lines = []
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                    lines.append((f"{self.name}_bucket{labels}", bucket_count))
+                labels = _format_labels(self.labelnames, key)
+                lines.append((f"{self.name}_sum{labels}", total))
+                lines.append((f"{self.name}_count{labels}", count))
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds the process's metrics and renders them in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector):
+        """
+        Registers a callable evaluated at every render, for values owned elsewhere
+        (such as cache statistics).
+
+        Args:
+            collector (callable): Returns a list of (name, type, documentation, labelnames,
+                                  {label values tuple: value}) tuples.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(f"{sample} {_format_value(value)}" for sample, value in metric.samples())
+        for collector in collectors:
+            for name, metric_type, documentation, labelnames, values in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(
+                    f"{name}{_format_labels(labelnames, key)} {_format_value(value)}"
+                    for key, value in sorted(values.items())
+                )
+        return "\n".join(lines) + "\n"
+
+
+class Trace:
+    """
+    The external calls made while producing one report, grouped by report stage, for
+    its debug breakdown.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, call, seconds, failed):
+        with self._lock:
+            summary = self._calls.setdefault(stage, {}).setdefault(
+                call, {"count": 0, "errors": 0, "seconds": 0.0})
+            summary["count"] += 1
+            summary["errors"] += int(failed)
+            summary["seconds"] += seconds
+
+    def summary(self):
+        """
+        Returns:
+            dict: {stage: {call: {"count": int, "errors": int, "seconds": float}}}
+        """
+        with self._lock:
+            return {
+                stage: {call: {**summary, "seconds": round(summary["seconds"], 4)} for call, summary in calls.items()}
+                for stage, calls in self._calls.items()
+            }
+
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+# Name of the report stage running in this context; set by the stage scheduler
+current_stage = contextvars.ContextVar("current_stage", default=None)
+
+metrics = MetricsRegistry()
+
+REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP requests handled, by route and status code.", ["method", "route", "status"])
+REQUEST_SECONDS = metrics.histogram(
+    "http_request_seconds", "Time to produce an HTTP response, by route.", ["method", "route"])
+STAGE_SECONDS = metrics.histogram(
+    "report_stage_seconds", "Duration of each report stage.", ["stage"])
+STAGE_ERRORS = metrics.counter(
+    "report_stage_errors_total", "Report stages that raised, by stage.", ["stage"])
+EXTERNAL_CALL_SECONDS = metrics.histogram(
+    "external_call_seconds", "Duration of calls to external services.", ["call"])
+EXTERNAL_CALL_ERRORS = metrics.counter(
+    "external_call_errors_total", "Calls to external services that failed.", ["call"])
+
+
+@contextmanager
+def trace():
+    """
+    Collects the external calls made in this context (including report stages started
+    from it) into a `Trace`.
+    """
+    current = Trace()
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(call):
+    """
+    Times a call to an external service, counting it as failed if it raises.
+
+    Args:
+        call (str): Name of the call, e.g. "nytimes_search" or "gemini_compare".
+    """
+    failed = False
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        failed = True
+        EXTERNAL_CALL_ERRORS.inc(call=call)
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        EXTERNAL_CALL_SECONDS.observe(seconds, call=call)
+        current = _current_trace.get()
+        if current is not None:
+            current.add(current_stage.get(), call, seconds, failed)
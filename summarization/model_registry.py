@@ -0,0 +1,150 @@
+import os
+import sys
+import threading
+import time
+
+from summarization.sentiment_analyzer import SentimentAnalyzer
+from summarization.topic_extractor import NewsTopicExtractor
+
+
+def resident_memory_bytes():
+    """
+    Returns the resident set size of the process, or 0 if it cannot be read.
+
+    Reading it is cheap, unlike tracing allocations, so it can bracket every model load.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak rather than current RSS outside Linux; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def load_background_corpus(path):
+    """
+    Reads a TF-IDF background corpus with one document per line.
+
+    Args:
+        path (str): Path of the corpus file, or None.
+
+    Returns:
+        list or None: The non-empty lines of the file, or None if no path is given.
+    """
+    if not path:
+        return None
+    with open(path, encoding="utf-8") as corpus_file:
+        return [line.strip() for line in corpus_file if line.strip()]
+
+
+class ModelRegistry:
+    """
+    A process-wide, thread-safe registry of warmed NLP resources.
+
+    Each model is built at most once, on first use or when `warm_up` is called,
+    and then shared by every report. Load time and the growth of the process's
+    resident memory during the load are recorded per model.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._factories = {
+            "topic_extractor": lambda: NewsTopicExtractor(
+                batch_size=int(os.getenv("SPACY_BATCH_SIZE", "64")),
+                n_process=int(os.getenv("SPACY_N_PROCESS", "1")),
+                background_corpus=load_background_corpus(os.getenv("TFIDF_BACKGROUND_CORPUS")),
+            ),
+            "sentiment_analyzer": lambda: SentimentAnalyzer(
+                positive_threshold=float(os.getenv("SENTIMENT_POSITIVE_THRESHOLD", "0.25")),
+                negative_threshold=float(os.getenv("SENTIMENT_NEGATIVE_THRESHOLD", "-0.25")),
+            ),
+        }
+        self._models = {}
+        self._stats = {}
+
+    def _load(self, name):
+        """
+        Builds the named model, recording how long it took and how much the resident
+        memory grew. Other threads allocating at the same time are counted too, so the
+        memory figure is an estimate.
+
+        Args:
+            name (str): The registry name of the model.
+
+        Returns:
+            object: The loaded model.
+        """
+        memory_before = resident_memory_bytes()
+        start = time.perf_counter()
+        try:
+            model = self._factories[name]()
+        finally:
+            load_seconds = time.perf_counter() - start
+            memory_after = resident_memory_bytes()
+
+        self._stats[name] = {
+            "load_seconds": round(load_seconds, 4),
+            "memory_bytes": max(memory_after - memory_before, 0),
+        }
+        return model
+
+    def get(self, name):
+        """
+        Returns the named model, loading it on first use.
+
+        Args:
+            name (str): The registry name of the model.
+
+        Returns:
+            object: The shared model instance.
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have finished loading while we waited for the lock
+            if name not in self._models:
+                self._models[name] = self._load(name)
+            return self._models[name]
+
+    def get_topic_extractor(self):
+        return self.get("topic_extractor")
+
+    def get_sentiment_analyzer(self):
+        return self.get("sentiment_analyzer")
+
+    def warm_up(self):
+        """
+        Loads every registered model so the first report does not pay for it.
+        """
+        for name in self._factories:
+            self.get(name)
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def ready(self):
+        """
+        Returns True once every registered model is loaded.
+        """
+        return all(name in self._models for name in self._factories)
+
+    def stats(self):
+        """
+        Returns load statistics for every model loaded so far.
+
+        Returns:
+            dict: {model_name: {"load_seconds": float, "memory_bytes": int}}
+        """
+        with self._lock:
+            return {name: dict(stat) for name, stat in self._stats.items()}
+
+
+model_registry = ModelRegistry()
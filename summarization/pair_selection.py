@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+
+
+class PairSelector:
+    """
+    Chooses which article pairs are worth a Gemini comparison, on the CPU only.
+
+    Summaries are vectorized with TF-IDF and compared by cosine similarity. Articles
+    similar enough to be about the same story form clusters. Pairs score higher the
+    more similar the articles are and the further apart their sentiment scores are,
+    so the same story told positively and negatively ranks first. The best pair of
+    every cluster is taken first, largest cluster first, then the best remaining
+    pairs, up to `budget` pairs in total. Pairs at least `min_similarity` alike are
+    preferred over the others, but when too few are, the best of the rest fill the
+    budget, so a page of mostly distinct stories still gets its comparisons.
+    """
+
+    def __init__(self, budget=5, cluster_threshold=0.2, min_similarity=0.15, max_uses_per_article=1):
+        """
+        Args:
+            budget (int): Maximum number of pairs, i.e. Gemini comparisons per report.
+            cluster_threshold (float): Cosine similarity at or above which two articles
+                                       belong to the same story cluster.
+            min_similarity (float): Cosine similarity below which a pair is only taken
+                                    once no more similar pair is left.
+            max_uses_per_article (int): Number of selected pairs an article can be part of.
+        """
+        self.budget = budget
+        self.cluster_threshold = cluster_threshold
+        self.min_similarity = min_similarity
+        self.max_uses_per_article = max_uses_per_article
+
+    @staticmethod
+    def similarity_matrix(articles):
+        """
+        Returns the n x n cosine similarity of the articles' titles and summaries.
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        texts = [f"{article.get('title') or ''} {article.get('summary') or ''}" for article in articles]
+        try:
+            vectors = TfidfVectorizer(stop_words='english', sublinear_tf=True).fit_transform(texts)
+        except ValueError:
+            # Every text is empty or made only of stop words
+            return np.zeros((len(articles), len(articles)))
+        # TF-IDF rows are L2-normalized, so the dot product is the cosine similarity
+        return (vectors @ vectors.T).toarray()
+
+    def select(self, articles):
+        """
+        Selects the pairs to compare.
+
+        Args:
+            articles (list): Articles with 'title' and 'summary', and optionally 'sentiment_score'.
+
+        Returns:
+            list: (i, j) article positions with i < j, at most `budget` of them, in
+                  selection order.
+        """
+        from scipy.sparse.csgraph import connected_components
+
+        n = len(articles)
+        if n < 2 or self.budget <= 0:
+            return []
+
+        similarity = self.similarity_matrix(articles)
+        sentiment = np.array([article.get("sentiment_score") or 0.0 for article in articles], dtype=float)
+        # Compound scores lie in [-1, 1], so the contrast bonus is at most 2
+        score = similarity * (1.0 + np.abs(sentiment[:, None] - sentiment[None, :]))
+
+        rows, columns = np.triu_indices(n, k=1)
+        # Related pairs rank before unrelated ones, each group by score
+        unrelated = similarity[rows, columns] < self.min_similarity
+        order = np.lexsort((-score[rows, columns], unrelated))
+        ranked = [(int(rows[k]), int(columns[k])) for k in order]
+
+        _, labels = connected_components(similarity >= self.cluster_threshold, directed=False)
+        cluster_sizes = np.bincount(labels)
+
+        uses = np.zeros(n, dtype=int)
+        selected = []
+
+        def take(pair):
+            i, j = pair
+            if len(selected) >= self.budget or pair in selected:
+                return False
+            if uses[i] >= self.max_uses_per_article or uses[j] >= self.max_uses_per_article:
+                return False
+            selected.append(pair)
+            uses[i] += 1
+            uses[j] += 1
+            return True
+
+        # One pair per multi-article cluster, the largest stories first
+        for cluster in sorted(set(labels), key=lambda label: (-cluster_sizes[label], label)):
+            if cluster_sizes[cluster] < 2:
+                continue
+            for pair in ranked:
+                if labels[pair[0]] == cluster and labels[pair[1]] == cluster and take(pair):
+                    break
+
+        # Fill the rest of the budget with the best remaining pairs
+        for pair in ranked:
+            if len(selected) >= self.budget:
+                break
+            take(pair)
+
+        return selected
+
+
+def pair_selector_from_env():
+    """
+    Builds the selector configured by GEMINI_PAIR_SELECTION ("similarity", the default,
+    or "sequential" for the original (1,2), (3,4), ... pairs), GEMINI_PAIR_BUDGET,
+    PAIR_CLUSTER_THRESHOLD and PAIR_MIN_SIMILARITY.
+
+    Returns:
+        PairSelector or None: None when sequential pairing is configured.
+    """
+    if os.getenv("GEMINI_PAIR_SELECTION", "similarity").lower() == "sequential":
+        return None
+    return PairSelector(
+        budget=int(os.getenv("GEMINI_PAIR_BUDGET", "5")),
+        cluster_threshold=float(os.getenv("PAIR_CLUSTER_THRESHOLD", "0.2")),
+        min_similarity=float(os.getenv("PAIR_MIN_SIMILARITY", "0.15")),
+    )
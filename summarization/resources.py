@@ -0,0 +1,83 @@
+import importlib.util
+import os
+import sys
+
+# NLTK data the models need, by name, with the path it is installed under in an NLTK data directory
+NLTK_RESOURCES = {
+    "vader_lexicon": "sentiment/vader_lexicon.zip",
+    "stopwords": "corpora/stopwords",
+}
+SPACY_MODEL = "en_core_web_sm"
+
+# Dependencies that take long to import are imported inside the function or constructor
+# that first needs them, never at module level, so importing the API stays fast and a
+# container can answer /healthz before any model is loaded. The models are loaded by
+# the model registry's warm-up instead. benchmarks/bench_import_time.py fails if
+# importing the API pulls in any of these.
+LAZY_MODULES = ("spacy", "sklearn", "nltk", "scipy", "gtts", "deep_translator", "google.genai")
+
+
+def nltk_data_directories():
+    """
+    Returns the directories NLTK searches for data, in its own order, without importing NLTK.
+    """
+    directories = [path for path in os.getenv("NLTK_DATA", "").split(os.pathsep) if path]
+    directories.append(os.path.join(os.path.expanduser("~"), "nltk_data"))
+    for prefix in dict.fromkeys([sys.prefix, sys.exec_prefix]):
+        directories.extend([
+            os.path.join(prefix, "nltk_data"),
+            os.path.join(prefix, "share", "nltk_data"),
+            os.path.join(prefix, "lib", "nltk_data"),
+        ])
+    directories.extend(["/usr/share/nltk_data", "/usr/local/share/nltk_data",
+                        "/usr/lib/nltk_data", "/usr/local/lib/nltk_data"])
+    return directories
+
+
+def find_nltk_resource(name):
+    """
+    Looks for an NLTK resource on disk, zipped or unpacked. Never downloads anything.
+
+    Args:
+        name (str): A key of NLTK_RESOURCES.
+
+    Returns:
+        str or None: The path of the resource, or None if it is not installed.
+    """
+    resource = NLTK_RESOURCES[name]
+    unpacked = resource[:-len(".zip")] if resource.endswith(".zip") else resource
+    for directory in nltk_data_directories():
+        for candidate in (resource, unpacked, unpacked + ".zip"):
+            path = os.path.join(directory, candidate)
+            if os.path.exists(path):
+                return path
+    return None
+
+
+def require_nltk_resource(name):
+    """
+    Raises:
+        LookupError: If the NLTK resource is not installed, with the command that installs it.
+    """
+    if find_nltk_resource(name) is None:
+        raise LookupError(
+            f"NLTK resource '{name}' is not installed. Install it ahead of time with "
+            f"`python -m nltk.downloader {name}` or point NLTK_DATA at a directory that has it."
+        )
+
+
+def spacy_model_installed(model=SPACY_MODEL):
+    # spaCy models are installed as Python packages, so finding the package is enough
+    return importlib.util.find_spec(model) is not None
+
+
+def check_resources():
+    """
+    Reports which model resources are installed, from the filesystem only.
+
+    Returns:
+        dict: {resource name: bool} for every NLTK resource and the spaCy model.
+    """
+    status = {name: find_nltk_resource(name) is not None for name in NLTK_RESOURCES}
+    status[SPACY_MODEL] = spacy_model_installed()
+    return status
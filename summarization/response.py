@@ -1,42 +1,202 @@
+import asyncio
+import os
+import threading
 import requests
+import httpx
 from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+from requests.adapters import HTTPAdapter
+from summarization.cache import ScrapeCache
+from summarization.metrics import span
+
+# One pooled session shared by every scraper instance, so reports reuse connections
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=int(os.getenv("SCRAPE_POOL_SIZE", "16"))))
+
+# "lxml" (default) or "html.parser", the original BeautifulSoup extraction
+EXTRACTION_ENGINE = os.getenv("SCRAPE_EXTRACTION_ENGINE", "lxml")
+
+def _has_class(class_name):
+    # XPath equivalent of BeautifulSoup's class_= match on one class of a multi-valued attribute
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+# Compiled once; each matches the first element with the class under the current anchor
+ARTICLE_ANCHORS = etree.XPath(f"//a[@href][.//h4[{_has_class('css-nsjm9t')}]]")
+TITLE_XPATH = etree.XPath(f"(.//h4[{_has_class('css-nsjm9t')}])[1]")
+SUMMARY_XPATH = etree.XPath(f"(.//p[{_has_class('css-e5tzus')}])[1]")
+SOURCE_XPATH = etree.XPath(f"(.//span[{_has_class('css-chk81a')}])[1]")
+AUTHOR_XPATH = etree.XPath(f"(.//p[{_has_class('css-1engk30')}])[1]")
+TIMESTAMP_XPATH = etree.XPath(f"(.//span[{_has_class('css-1t2tqhf')}])[1]")
+
+def _element_text(elements):
+    # Same as BeautifulSoup's get_text(strip=True): stripped text pieces joined without spaces
+    if not elements:
+        return None
+    return "".join(piece.strip() for piece in elements[0].itertext())
+
+scrape_cache = ScrapeCache(
+    fresh_seconds=float(os.getenv("SCRAPE_FRESH_SECONDS", "300")),
+    stale_seconds=float(os.getenv("SCRAPE_STALE_SECONDS", "3600")),
+)
 
 class NYTimesScraper:
-    def __init__(self, company_name):
+    def __init__(self, company_name, cache=scrape_cache, date_range=None):
         """
         Initializes the NYTimesScraper with the company name to search for.
 
         Args:
             company_name (str): The name of the company to search for.
+            cache (ScrapeCache, optional): Cache of parsed search results. If None, every call fetches.
+            date_range (tuple, optional): (start, end) dates limiting the search, so that
+                                          different ranges return different result pages.
         """
         self.company_name = company_name
+        self.cache = cache
+        self.date_range = date_range
+        self.cache_key = ScrapeCache.normalize_key(company_name)
+        if date_range is not None:
+            self.cache_key += " " + "-".join(day.strftime("%Y%m%d") for day in date_range)
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
         }
 
-    def fetch_nytimes_search_results(self):
+    def get_search_url(self):
+        """
+        Builds the New York Times search URL for the company name.
+
+        Returns:
+            str: The NYTimes search URL.
+        """
+        url = f"https://www.nytimes.com/search?dropmab=false&lang=en&query={self.company_name}&sections=Business%7Cnyt%3A%2F%2Fsection%2F0415b2b0-513a-5e78-80da-21ab770cb753&sort=best&types=article"
+        if self.date_range is not None:
+            start, end = self.date_range
+            url += f"&startDate={start.strftime('%Y%m%d')}&endDate={end.strftime('%Y%m%d')}"
+        return url
+
+    def _request_headers(self, cached_entry=None):
+        # Turn the request into a conditional one when we hold validators from an earlier fetch
+        headers = dict(self.headers)
+        if cached_entry is not None:
+            if cached_entry.get("etag"):
+                headers["If-None-Match"] = cached_entry["etag"]
+            if cached_entry.get("last_modified"):
+                headers["If-Modified-Since"] = cached_entry["last_modified"]
+        return headers
+
+    def fetch_nytimes_search_results(self, cached_entry=None):
         """
         Fetches search results from the New York Times website for the given company name.
 
+        Args:
+            cached_entry (dict, optional): A cache entry whose validators make the request
+                                           conditional. The server may then answer 304.
+
         Returns:
             requests.Response: The HTTP response from the NYTimes search URL.
         """
         # Construct the search URL
-        search_url = f"https://www.nytimes.com/search?dropmab=false&lang=en&query={self.company_name}&sections=Business%7Cnyt%3A%2F%2Fsection%2F0415b2b0-513a-5e78-80da-21ab770cb753&sort=best&types=article"
+        search_url = self.get_search_url()
 
         try:
-            # Make the HTTP GET request
-            response = requests.get(search_url, headers=self.headers, timeout=15)
-            response.raise_for_status()  # Raise an exception for HTTP errors
+            # Make the HTTP GET request over the shared connection pool
+            with span("nytimes_search"):
+                response = session.get(search_url, headers=self._request_headers(cached_entry), timeout=15)
+                response.raise_for_status()  # Raise an exception for HTTP errors
             return response
         except requests.exceptions.RequestException as e:
             print(f"An error occurred while fetching search results: {e}")
             return None
 
+    async def fetch_nytimes_search_results_async(self, client=None, cached_entry=None):
+        """
+        Fetches search results without blocking the event loop.
+
+        Args:
+            client (httpx.AsyncClient, optional): A client to reuse. If None, a
+                                                  temporary client is created.
+            cached_entry (dict, optional): A cache entry whose validators make the request conditional.
+
+        Returns:
+            httpx.Response: The HTTP response from the NYTimes search URL, or None on error.
+        """
+        search_url = self.get_search_url()
+        headers = self._request_headers(cached_entry)
+
+        try:
+            with span("nytimes_search"):
+                if client is None:
+                    async with httpx.AsyncClient(follow_redirects=True) as temp_client:
+                        response = await temp_client.get(search_url, headers=headers, timeout=15)
+                else:
+                    response = await client.get(search_url, headers=headers, timeout=15)
+                # httpx treats every non-2xx status as an error, including 304 Not Modified
+                if response.status_code != 304:
+                    response.raise_for_status()
+            return response
+        except httpx.HTTPError as e:
+            print(f"An error occurred while fetching search results: {e}")
+            return None
+
     def extract_article_info(self, url_response):
         """
         Extracts all the relevant information about the articles from the URL response.
 
+        Args:
+            url_response (requests.Response): The HTTP response from the NYTimes search URL.
+
+        Returns:
+            list: A list of dictionaries containing article information.
+        """
+        if EXTRACTION_ENGINE == "html.parser":
+            return self.extract_article_info_soup(url_response)
+        return self.extract_article_info_lxml(url_response)
+
+    def extract_article_info_lxml(self, url_response):
+        """
+        Fast path of `extract_article_info`: parses the page with lxml and selects only
+        the anchors that hold a result title with precompiled XPath expressions.
+        Returns the same article dictionaries as `extract_article_info_soup`.
+        """
+        articles = []
+        if not url_response.text or not url_response.text.strip():
+            return articles
+        try:
+            root = lxml_html.fromstring(url_response.text)
+        except (etree.ParserError, ValueError) as e:
+            print(f"Error parsing search results: {e}")
+            return articles
+
+        for a_tag in ARTICLE_ANCHORS(root):
+            try:
+                title = _element_text(TITLE_XPATH(a_tag))
+                # Only proceed if the title is available (assume it's an article)
+                if title:
+                    # The timestamp is the text right after the "Print Archive" span
+                    timestamp_spans = TIMESTAMP_XPATH(a_tag)
+                    timestamp = None
+                    if timestamp_spans and timestamp_spans[0].tail is not None:
+                        timestamp = timestamp_spans[0].tail.strip()
+                        if timestamp:
+                            timestamp = ", ".join(timestamp.split(",")[:2])  # Format timestamp
+
+                    articles.append({
+                        'link': a_tag.get("href"),
+                        'title': title,
+                        'source': _element_text(SOURCE_XPATH(a_tag)),
+                        'author': _element_text(AUTHOR_XPATH(a_tag)),
+                        'timestamp': timestamp,
+                        'summary': _element_text(SUMMARY_XPATH(a_tag))
+                    })
+            except Exception as e:
+                print(f"Error processing an article: {e}")
+
+        return articles
+
+    def extract_article_info_soup(self, url_response):
+        """
+        Extracts the articles with BeautifulSoup's pure-Python "html.parser". Slower than
+        `extract_article_info_lxml`, kept as a reference and a fallback.
+
         Args:
             url_response (requests.Response): The HTTP response from the NYTimes search URL.
 
@@ -92,20 +252,116 @@ class NYTimesScraper:
 
         return articles
 
-    def get_articles(self):
+    def _store_response(self, response, cached_entry, articles=None):
         """
-        Fetches search results and extracts article information.
+        Updates the cache from a fetch response and returns the articles to serve.
+
+        Args:
+            response: The (possibly 304) HTTP response.
+            cached_entry (dict): The entry the request was conditional on, if any.
+            articles (list, optional): Articles already parsed from the response.
 
         Returns:
             list: A list of dictionaries containing article information.
         """
+        if response.status_code == 304 and cached_entry is not None:
+            if self.cache is not None:
+                self.cache.touch(self.cache_key)
+            return cached_entry["articles"]
+
+        if articles is None:
+            articles = self.extract_article_info(response)
+        # An empty page is more likely a blocked or changed page than a real answer, so it is not cached
+        if self.cache is not None and articles:
+            self.cache.store(
+                self.cache_key,
+                articles,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return articles
+
+    def _lookup_cache(self):
+        """
+        Returns the cached entry and its state, starting a background revalidation when
+        the entry is stale.
+        """
+        if self.cache is None:
+            return None, "miss"
+        entry, state = self.cache.lookup(self.cache_key)
+        if state == "stale" and self.cache.begin_refresh(self.cache_key):
+            threading.Thread(target=self._refresh_in_background, args=(entry,), daemon=True).start()
+        return entry, state
+
+    def _refresh_in_background(self, cached_entry):
+        try:
+            response = self.fetch_nytimes_search_results(cached_entry)
+            if response is not None:
+                self._store_response(response, cached_entry)
+        except Exception as e:
+            print(f"Error refreshing cached search results: {e}")
+        finally:
+            self.cache.end_refresh(self.cache_key)
+
+    def get_articles(self, throttle=None):
+        """
+        Fetches search results and extracts article information. Results are served from
+        the scrape cache while fresh, or while stale with a background revalidation.
+
+        Args:
+            throttle (callable, optional): Called right before a network request, e.g. to
+                                           wait for a rate limiter. Not called for cache hits.
+
+        Returns:
+            list: A list of dictionaries containing article information.
+        """
+        cached_entry, state = self._lookup_cache()
+        if state != "miss":
+            # Copies, because later stages add keys to the article dictionaries
+            return [dict(article) for article in cached_entry["articles"]]
+
+        if throttle is not None:
+            throttle()
         # Fetch search results
-        search_response = self.fetch_nytimes_search_results()
+        search_response = self.fetch_nytimes_search_results(cached_entry)
         if search_response:
             # Extract article information
-            articles = self.extract_article_info(search_response)
-            return articles
+            articles = self._store_response(search_response, cached_entry)
+            return [dict(article) for article in articles]
         else:
             print("Failed to fetch search results.")
             return []
 
+    async def get_articles_async(self, client=None, executor=None, throttle=None):
+        """
+        Async counterpart of `get_articles`. The HTML parsing is CPU-bound, so it
+        runs in the given executor instead of on the event loop.
+
+        Args:
+            client (httpx.AsyncClient, optional): A client to reuse for the fetch.
+            executor (concurrent.futures.Executor, optional): Executor for parsing.
+                                                              Defaults to the loop's executor.
+            throttle (callable, optional): Coroutine function awaited right before a network
+                                           request. Not awaited for cache hits.
+
+        Returns:
+            list: A list of dictionaries containing article information.
+        """
+        cached_entry, state = self._lookup_cache()
+        if state != "miss":
+            return [dict(article) for article in cached_entry["articles"]]
+
+        if throttle is not None:
+            await throttle()
+
+        search_response = await self.fetch_nytimes_search_results_async(client, cached_entry)
+        if search_response:
+            articles = None
+            if search_response.status_code != 304:
+                loop = asyncio.get_running_loop()
+                articles = await loop.run_in_executor(executor, self.extract_article_info, search_response)
+            articles = self._store_response(search_response, cached_entry, articles)
+            return [dict(article) for article in articles]
+        else:
+            print("Failed to fetch search results.")
+            return []
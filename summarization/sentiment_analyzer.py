@@ -1,21 +1,41 @@
-import nltk
-nltk.download("vader_lexicon")
-from nltk.sentiment import SentimentIntensityAnalyzer
+from functools import lru_cache
+import numpy as np
+from summarization.resources import require_nltk_resource
+
+SCORE_KEYS = ("compound", "pos", "neg", "neu")
 
 class SentimentAnalyzer:
     """
     A class to perform sentiment analysis on a list of articles using VADER.
     """
 
-    def __init__(self, articles):
+    def __init__(self, positive_threshold=0.25, negative_threshold=-0.25, cache_size=4096):
         """
-        Initializes the SentimentAnalyzer with a list of articles.
+        Initializes the SentimentAnalyzer. The VADER analyzer is built once and
+        reused for every call to `analyze_articles`.
 
         Args:
-            articles (list): A list of dictionaries containing article details.
+            positive_threshold (float): Compound score at or above which a text is "positive".
+            negative_threshold (float): Compound score at or below which a text is "negative".
+            cache_size (int): Number of distinct texts whose scores are memoized.
         """
-        self.articles = articles
+        require_nltk_resource("vader_lexicon")
+        from nltk.sentiment import SentimentIntensityAnalyzer
+
         self.sia = SentimentIntensityAnalyzer()  # Initialize VADER sentiment analyzer
+        self.positive_threshold = positive_threshold
+        self.negative_threshold = negative_threshold
+        # Syndicated summaries repeat, so identical texts are only scored once
+        self._polarity_scores = lru_cache(maxsize=cache_size)(self.sia.polarity_scores)
+
+    def _label(self, compound):
+        # Determine sentiment based on compound score
+        if compound >= self.positive_threshold:
+            return "positive"
+        elif compound <= self.negative_threshold:
+            return "negative"
+        else:
+            return "neutral"
 
     def analyze_sentiment(self, text):
         """
@@ -31,25 +51,50 @@ class SentimentAnalyzer:
             return "neutral"  # Return neutral if text is empty
 
         # Get sentiment scores
-        sentiment_scores = self.sia.polarity_scores(text)
+        sentiment_scores = self._polarity_scores(text)
 
-        # Determine sentiment based on compound score
-        if sentiment_scores["compound"] >= 0.25:
-            return "positive"
-        elif sentiment_scores["compound"] <= -0.25:
-            return "negative"
-        else:
-            return "neutral"
+        return self._label(sentiment_scores["compound"])
 
-    def analyze_articles(self):
+    def score_texts(self, texts):
+        """
+        Scores a whole list of texts at once.
+
+        Args:
+            texts (list): The texts to score. Empty or missing texts score 0 and are "neutral".
+
+        Returns:
+            dict: {"labels": list of str, "compound"/"pos"/"neg"/"neu": np.ndarray}, one
+                  entry per text in input order.
+        """
+        scores = np.zeros((len(texts), len(SCORE_KEYS)))
+        for row, text in enumerate(texts):
+            if text:
+                polarity = self._polarity_scores(text)
+                scores[row] = [polarity[key] for key in SCORE_KEYS]
+
+        compound = scores[:, 0]
+        labels = np.where(
+            compound >= self.positive_threshold, "positive",
+            np.where(compound <= self.negative_threshold, "negative", "neutral"),
+        )
+
+        result = {key: scores[:, column] for column, key in enumerate(SCORE_KEYS)}
+        result["labels"] = labels.tolist()
+        return result
+
+    def analyze_articles(self, articles):
         """
         Performs sentiment analysis on all articles in the list.
 
+        Args:
+            articles (list): A list of dictionaries containing article details.
+
         Returns:
             list: A list of dictionaries with added sentiment analysis results.
         """
-        for article in self.articles:
-            sentiment = self.analyze_sentiment(article.get("summary"))
+        scores = self.score_texts([article.get("summary") for article in articles])
+        for article, sentiment, compound in zip(articles, scores["labels"], scores["compound"]):
             article["sentiment"] = sentiment  # Add sentiment to the article dictionary
+            article["sentiment_score"] = float(compound)
 
-        return self.articles
\ No newline at end of file
+        return articles
@@ -1,18 +1,199 @@
+import hashlib
 import os
-import shutil
-from gtts import gTTS
-from deep_translator import GoogleTranslator
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from summarization.metrics import span
+
+DEFAULT_OUTPUT_DIRECTORY = os.getenv("AUDIO_OUTPUT_DIRECTORY", "audio_outputs")
+DEFAULT_MAX_FILES = int(os.getenv("AUDIO_CACHE_MAX_FILES", "500"))
+DEFAULT_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+DEFAULT_MAX_AGE_SECONDS = float(os.getenv("AUDIO_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+
+DEFAULT_LANGUAGES = [language.strip() for language in os.getenv("AUDIO_LANGUAGES", "hi").split(",") if language.strip()]
+
+# Serializes eviction between converters of the same process
+_eviction_lock = threading.Lock()
+
+class GoogleTranslateBackend:
+    """
+    Translates through Google Translate, packing several strings into one request.
+    """
+
+    # Google Translate rejects requests longer than 5000 characters
+    MAX_REQUEST_CHARS = 4500
+    SEPARATOR = "\n"
+
+    def translate(self, text, target):
+        from deep_translator import GoogleTranslator
+
+        with span("translate"):
+            return GoogleTranslator(source='auto', target=target).translate(text)
+
+    def translate_batch(self, texts, target):
+        """
+        Translates several strings with as few requests as possible, by joining them
+        with line breaks and splitting the translation on the same line breaks.
+
+        Args:
+            texts (list): The strings to translate. Strings containing line breaks are
+                          translated on their own.
+            target (str): The target language code.
+
+        Returns:
+            list: The translations, in input order.
+        """
+        translations = [None] * len(texts)
+        chunk = []
+        chunk_chars = 0
+
+        def flush():
+            if not chunk:
+                return
+            joined = self.translate(self.SEPARATOR.join(texts[i] for i in chunk), target)
+            parts = joined.split(self.SEPARATOR) if joined else []
+            if len(parts) == len(chunk):
+                for i, part in zip(chunk, parts):
+                    translations[i] = part.strip()
+            else:
+                # The service merged or split lines; translate this chunk one string at a time
+                for i in chunk:
+                    translations[i] = self.translate(texts[i], target)
+
+        for i, text in enumerate(texts):
+            if self.SEPARATOR in text or len(text) > self.MAX_REQUEST_CHARS:
+                translations[i] = self.translate(text, target)
+                continue
+            if chunk and chunk_chars + len(text) + 1 > self.MAX_REQUEST_CHARS:
+                flush()
+                chunk, chunk_chars = [], 0
+            chunk.append(i)
+            chunk_chars += len(text) + 1
+        flush()
+        return translations
+
+class LocalTranslationBackend:
+    """
+    An offline stand-in for tests and benchmarks. Returns the configured translation
+    if there is one, otherwise the text tagged with the target language.
+    """
+
+    def __init__(self, translations=None):
+        """
+        Args:
+            translations (dict, optional): {(text, target): translation}
+        """
+        self.translations = translations or {}
+        self.requests = 0
+
+    def translate(self, text, target):
+        self.requests += 1
+        return self.translations.get((text, target), f"[{target}] {text}")
+
+    def translate_batch(self, texts, target):
+        self.requests += 1
+        return [self.translations.get((text, target), f"[{target}] {text}") for text in texts]
+
+class Translator:
+    """
+    Memoizes translations by (text, target language) in a bounded LRU cache, and sends
+    the misses of a batch to the backend together.
+    """
+
+    def __init__(self, backend=None, cache_size=1024):
+        """
+        Args:
+            backend (optional): Object with translate(text, target) and
+                                translate_batch(texts, target). Defaults to Google Translate.
+            cache_size (int): Maximum number of translations kept.
+        """
+        self.backend = backend or GoogleTranslateBackend()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def translate(self, text, target):
+        return self.translate_many([text], target)[0]
+
+    def translate_many(self, texts, target):
+        """
+        Translates a list of strings, requesting only those not already cached.
+
+        Args:
+            texts (list): The strings to translate.
+            target (str): The target language code.
+
+        Returns:
+            list: The translations, in input order.
+        """
+        results = [None] * len(texts)
+        missing = OrderedDict()  # text -> positions, so duplicates are requested once
+        with self._lock:
+            for position, text in enumerate(texts):
+                key = (text, target)
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[position] = self._cache[key]
+                    self.hits += 1
+                else:
+                    missing.setdefault(text, []).append(position)
+                    self.misses += 1
+
+        if missing:
+            missing_texts = list(missing)
+            translations = self.backend.translate_batch(missing_texts, target)
+            with self._lock:
+                for text, translation in zip(missing_texts, translations):
+                    for position in missing[text]:
+                        results[position] = translation
+                    self._cache[(text, target)] = translation
+                    self._cache.move_to_end((text, target))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+# Shared by every converter so translations are reused across reports
+translator = Translator()
 
 class TextToSpeechConverter:
-    def __init__(self, output_directory="audio_outputs"):
+    def __init__(self, output_directory=DEFAULT_OUTPUT_DIRECTORY, max_files=DEFAULT_MAX_FILES,
+                 max_bytes=DEFAULT_MAX_BYTES, max_age_seconds=DEFAULT_MAX_AGE_SECONDS,
+                 translator=translator, languages=None):
+        """
+        Initializes the converter. Audio files are content-addressed, so reports share the
+        directory safely and identical text is only synthesized once.
+
+        Args:
+            output_directory (str): Directory the audio files are stored in.
+            max_files (int): Maximum number of audio files kept.
+            max_bytes (int): Maximum total size of the audio files kept.
+            max_age_seconds (float): Files not used for this long are removed.
+            translator (Translator): Translation layer used before synthesis.
+            languages (list, optional): Target languages of `convert_to_audio_multi`.
+                                        Defaults to AUDIO_LANGUAGES (Hindi only).
+        """
         self.output_directory = output_directory
-        
-        # Remove existing directory and create a fresh one
-        if os.path.exists(self.output_directory):
-            shutil.rmtree(self.output_directory)
-        
-        # Create a new, empty directory
-        os.makedirs(self.output_directory)
+        self.translator = translator
+        self.languages = languages or DEFAULT_LANGUAGES
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+
+        os.makedirs(self.output_directory, exist_ok=True)
+
+    @staticmethod
+    def audio_id(text, language):
+        """
+        Returns the content address of the audio for a text in a language.
+        """
+        return hashlib.sha256(f"{language}\0{text}".encode("utf-8")).hexdigest()
 
     def convert_english_to_hindi_audio(self, english_text, filename=None):
         """
@@ -20,29 +201,135 @@ class TextToSpeechConverter:
 
         Args:
             english_text (str): The English text to convert to audio.
-            filename (str, optional): The desired filename for the audio output. 
-                                      If None, generates a default filename.
-        
+            filename (str, optional): The desired filename for the audio output.
+                                      If None, the file is named after a hash of the
+                                      Hindi text and reused if it already exists.
+
+        Returns:
+            str or None: Path to the saved audio file, or None if an error occurs.
+        """
+        return self.convert_to_audio(english_text, 'hi', filename)
+
+    def convert_to_audio(self, english_text, language, filename=None):
+        """
+        Translates the given English text, converts it to audio, and saves it as an MP3 file.
+
+        Args:
+            english_text (str): The English text to convert to audio.
+            language (str): The language code to translate to and speak in.
+            filename (str, optional): The desired filename for the audio output.
+
         Returns:
             str or None: Path to the saved audio file, or None if an error occurs.
         """
         try:
-            # Generate a default filename if not provided
-            if filename is None:
-                filename = f"news_coverage.mp3"
-            
-            # Translate English to Hindi using deep_translator
-            hindi_text = GoogleTranslator(source='auto', target='hi').translate(english_text)
-
-            # Convert Hindi text to audio
-            tts = gTTS(text=hindi_text, lang='hi')
-            filepath = os.path.join(self.output_directory, filename)
-            tts.save(filepath)
-            
-            print(f"English text: {english_text}")
-            print(f"Hindi translation: {hindi_text}")
-            print(f"Audio saved to: {filepath}")
-            return filepath
+            translated_text = self.translator.translate(english_text, language)
+            return self._synthesize(english_text, translated_text, language, filename)
         except Exception as e:
             print(f"Error during audio conversion: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def convert_to_audio_multi(self, english_text, languages=None):
+        """
+        Converts the given English text to audio in several languages.
+
+        Args:
+            english_text (str): The English text to convert to audio.
+            languages (list, optional): Language codes. Defaults to the converter's languages.
+
+        Returns:
+            dict: {language: path of the audio file, or None if that language failed}
+        """
+        return {
+            language: self.convert_to_audio(english_text, language)
+            for language in (languages or self.languages)
+        }
+
+    def convert_many_to_audio(self, english_texts, languages=None):
+        """
+        Converts several English texts to audio in several languages. The texts are
+        translated together, with one batched translation per language.
+
+        Args:
+            english_texts (list): The English texts to convert to audio.
+            languages (list, optional): Language codes. Defaults to the converter's languages.
+
+        Returns:
+            list: One {language: path of the audio file, or None if it failed} per text,
+                  in input order.
+        """
+        results = [{} for _ in english_texts]
+        for language in (languages or self.languages):
+            try:
+                translated_texts = self.translator.translate_many(list(english_texts), language)
+            except Exception as e:
+                print(f"Error during translation to {language}: {e}")
+                translated_texts = [None] * len(english_texts)
+            for tracks, english_text, translated_text in zip(results, english_texts, translated_texts):
+                tracks[language] = None
+                if translated_text is None:
+                    continue
+                try:
+                    tracks[language] = self._synthesize(english_text, translated_text, language)
+                except Exception as e:
+                    print(f"Error during audio conversion: {e}")
+        return results
+
+    def _synthesize(self, english_text, translated_text, language, filename=None):
+        if filename is None:
+            filename = f"{self.audio_id(translated_text, language)}.mp3"
+            filepath = os.path.join(self.output_directory, filename)
+            if os.path.exists(filepath):
+                # Mark as recently used so eviction keeps it
+                os.utime(filepath)
+                print(f"Reusing audio: {filepath}")
+                return filepath
+        filepath = os.path.join(self.output_directory, filename)
+
+        # Convert the translated text to audio, writing to a private temporary file first
+        # so a concurrent reader never sees a half-written MP3
+        from gtts import gTTS
+
+        tts = gTTS(text=translated_text, lang=language)
+        temp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+        try:
+            with span("tts_save"):
+                tts.save(temp_path)
+            os.replace(temp_path, filepath)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        print(f"English text: {english_text}")
+        print(f"Translation ({language}): {translated_text}")
+        print(f"Audio saved to: {filepath}")
+        self.evict()
+        return filepath
+
+    def evict(self):
+        """
+        Removes audio files that are too old, then the least recently used ones until
+        the store is within its file count and size limits.
+        """
+        with _eviction_lock:
+            now = time.time()
+            files = []
+            for entry in os.scandir(self.output_directory):
+                if entry.is_file() and entry.name.endswith(".mp3"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+            files.sort()  # Least recently used first
+
+            total_bytes = sum(size for _, size, _ in files)
+            remaining = len(files)
+            for mtime, size, path in files:
+                too_old = now - mtime > self.max_age_seconds
+                over_limit = remaining > self.max_files or total_bytes > self.max_bytes
+                if not (too_old or over_limit):
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # Already removed by another process
+                remaining -= 1
+                total_bytes -= size
@@ -1,26 +1,43 @@
-import spacy
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
+from summarization.resources import SPACY_MODEL, require_nltk_resource, spacy_model_installed
 
-# Download necessary NLTK resources
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
+# Topics only need named entities and POS tags, so the components that produce
+# neither are not loaded at all
+UNUSED_PIPES = ["parser", "lemmatizer"]
 
 class NewsTopicExtractor:
-    def __init__(self):
+    def __init__(self, batch_size=64, n_process=1, background_corpus=None):
+        """
+        Initializes the extractor.
+
+        Args:
+            batch_size (int): Number of summaries spaCy processes per batch in `nlp.pipe`.
+            n_process (int): Number of processes `nlp.pipe` uses.
+            background_corpus (list, optional): Documents to fit the TF-IDF fallback on once.
+                                                If None, it is fitted on each batch of summaries.
+        """
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.background_vectorizer = None
+        self.background_feature_names = None
+
+        # Resources are installed ahead of time (see the Dockerfile); nothing is downloaded here
+        require_nltk_resource("stopwords")
+        if not spacy_model_installed():
+            raise OSError(f"spaCy model '{SPACY_MODEL}' is not installed. "
+                          f"Install it ahead of time with `python -m spacy download {SPACY_MODEL}`.")
+
+        import spacy
+        from nltk.corpus import stopwords
+
         # Load spaCy English model
-        try:
-            self.nlp = spacy.load('en_core_web_sm')
-        except OSError:
-            print("Downloading spaCy English model...")
-            spacy.cli.download("en_core_web_sm")
-            self.nlp = spacy.load('en_core_web_sm')
-        
+        self.nlp = spacy.load(SPACY_MODEL, exclude=UNUSED_PIPES)
+
         # Stop words to filter out
         self.stop_words = set(stopwords.words('english'))
+
+        if background_corpus:
+            self.fit_background(background_corpus)
     
     def extract_topics(self, summary, num_topics=3):
         """
@@ -34,8 +51,87 @@ class NewsTopicExtractor:
             list: Extracted topics
         """
         # Process the summary with spaCy
-        doc = self.nlp(summary)
-        
+        return self.extract_topics_batch([summary], num_topics)[0]
+
+    def fit_background(self, corpus):
+        """
+        Fits the TF-IDF fallback on a background corpus, so IDF weights come from many
+        documents instead of just the summaries of one batch
+
+        Args:
+            corpus (list): Background document texts
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1,2))
+        vectorizer.fit(corpus)
+        self.background_vectorizer = vectorizer
+        self.background_feature_names = vectorizer.get_feature_names_out()
+
+    def extract_topics_batch(self, summaries, num_topics=3, batch_size=None, n_process=None):
+        """
+        Extract topics from many news summaries, streaming them through `nlp.pipe`
+
+        Args:
+            summaries (list): News summary texts
+            num_topics (int): Number of topics to extract per summary
+            batch_size (int, optional): Overrides the extractor's batch size
+            n_process (int, optional): Overrides the extractor's number of processes
+
+        Returns:
+            list: One list of extracted topics per summary, in input order
+        """
+        docs = self.nlp.pipe(
+            summaries,
+            batch_size=batch_size or self.batch_size,
+            n_process=n_process or self.n_process,
+        )
+        topic_lists = [self._topics_from_doc(doc) for doc in docs]
+
+        # If not enough topics, use TF-IDF to extract more
+        short_indices = [i for i, topics in enumerate(topic_lists) if len(topics) < num_topics]
+        if short_indices:
+            tfidf_topics = self._tfidf_topics(summaries, short_indices, num_topics)
+            for i, extra_topics in zip(short_indices, tfidf_topics):
+                topic_lists[i].extend(extra_topics)
+
+        # Ensure unique topics, limit to num_topics and capitalize them
+        return [
+            [topic.capitalize() for topic in list(dict.fromkeys(topics))[:num_topics]]
+            for topics in topic_lists
+        ]
+
+    def _tfidf_topics(self, summaries, indices, num_topics):
+        """
+        Picks the top TF-IDF terms of the summaries at `indices`. The vectorizer is the
+        background one if fitted, otherwise one fitted once over the whole batch.
+
+        Returns:
+            list: One list of terms per index, highest score first
+        """
+        if self.background_vectorizer is not None:
+            vectorizer = self.background_vectorizer
+            feature_names = self.background_feature_names
+            tfidf_matrix = vectorizer.transform([summaries[i] for i in indices])
+        else:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
+            vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1,2))
+            tfidf_matrix = vectorizer.fit_transform(summaries)[indices]
+            feature_names = vectorizer.get_feature_names_out()
+
+        # Select the top terms straight from each sparse row's non-zero entries
+        tfidf_matrix = tfidf_matrix.tocsr()
+        results = []
+        for row in range(tfidf_matrix.shape[0]):
+            start, end = tfidf_matrix.indptr[row], tfidf_matrix.indptr[row + 1]
+            scores = tfidf_matrix.data[start:end]
+            columns = tfidf_matrix.indices[start:end]
+            top = np.argsort(-scores, kind='stable')[:num_topics]
+            results.append([feature_names[columns[i]] for i in top])
+        return results
+
+    def _topics_from_doc(self, doc):
         # Extract named entities and nouns as potential topics
         potential_topics = []
         
@@ -50,36 +146,39 @@ class NewsTopicExtractor:
                                  and len(token.text) > 2])
         
         # Remove duplicates while preserving order
-        topics = list(dict.fromkeys(potential_topics))
-        
-        # If not enough topics, use TF-IDF to extract more
-        if len(topics) < num_topics:
-            vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1,2))
-            tfidf_matrix = vectorizer.fit_transform([summary])
-            feature_names = vectorizer.get_feature_names_out()
-            tfidf_scores = tfidf_matrix.toarray()[0]
-            
-            # Get top TF-IDF terms
-            top_indices = tfidf_scores.argsort()[-num_topics:][::-1]
-            tfidf_topics = [feature_names[i] for i in top_indices]
-            
-            topics.extend(tfidf_topics)
-        
-        # Ensure unique topics and limit to num_topics
-        topics = list(dict.fromkeys(topics))[:num_topics]
-        
-        # Capitalize topics
-        topics = [topic.capitalize() for topic in topics]
-        
-        return topics
+        return list(dict.fromkeys(potential_topics))
     
     def get_articles_with_topics(self, articles):
+        """
+        Adds a 'topics' list to a copy of every article that has a summary. All summaries
+        are processed in one `nlp.pipe` pass.
+
+        Args:
+            articles (list): A list of dictionaries containing article details
+
+        Returns:
+            list: The article copies, with topics added
+        """
+        batch_indices = [
+            index for index, article in enumerate(articles)
+            if isinstance(article, dict) and isinstance(article.get("summary"), str)
+        ]
+        batch_topics = {}
+        try:
+            topic_lists = self.extract_topics_batch([articles[index]["summary"] for index in batch_indices])
+            batch_topics = dict(zip(batch_indices, topic_lists))
+        except Exception as e:
+            # Fall back to one document at a time so a single bad summary doesn't lose the batch
+            print(f"Error processing the article batch: {e}")
+
         processed_articles = []
-        for article in articles:
+        for index, article in enumerate(articles):
             try:
                 # Create a copy of the article dictionary to avoid modifying the original
                 processed_article = article.copy()
-                if isinstance(processed_article, dict) and "summary" in processed_article:
+                if index in batch_topics:
+                    processed_article["topics"] = batch_topics[index]
+                elif isinstance(processed_article, dict) and "summary" in processed_article:
                     topic_list = self.extract_topics(processed_article["summary"])
                     processed_article["topics"] = topic_list
                 processed_articles.append(processed_article)
@@ -89,4 +188,3 @@ class NewsTopicExtractor:
                 processed_articles.append(article)
 
         return processed_articles
-
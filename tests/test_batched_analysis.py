@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+
+from summarization.llm_response import CoverageComparison
+
+ARTICLES = [
+    {"title": f"Title {i}", "summary": f"Summary of article {i}", "link": f"https://example.com/{i}"}
+    for i in range(4)
+]
+
+
+def make_comparison(responses):
+    """
+    A CoverageComparison that answers every Gemini call from `responses`, keyed by call name.
+    """
+    comparison = CoverageComparison("key", batched=True, cache=None, pair_selector=None)
+    comparison.calls = []
+
+    def generate(prompt, call="gemini"):
+        comparison.calls.append(call)
+        return responses[call]
+
+    comparison._generate = generate
+    return comparison
+
+
+def batched_response(num_pairs, final="Mixed  coverage\noverall."):
+    return json.dumps({
+        "Coverage Differences": [
+            {"Pair": pair, "Comparison": f"Comparison  {pair}", "Impact": f"Impact {pair}"}
+            for pair in range(num_pairs, 0, -1)
+        ],
+        "Final Sentiment Analysis": final,
+    })
+
+
+def test_parse_batched_orders_by_pair_and_normalizes_whitespace():
+    comparison = make_comparison({})
+    differences, final = comparison._parse_batched(batched_response(2), 2)
+    assert differences == [
+        {"Comparison": "Comparison 1", "Impact": "Impact 1"},
+        {"Comparison": "Comparison 2", "Impact": "Impact 2"},
+    ]
+    assert final == {"Final Sentiment Analysis": "Mixed coverage overall."}
+
+
+def test_parse_batched_strips_code_fences():
+    comparison = make_comparison({})
+    differences, _ = comparison._parse_batched(f"```json\n{batched_response(1)}\n```", 1)
+    assert differences == [{"Comparison": "Comparison 1", "Impact": "Impact 1"}]
+
+
+def test_parse_batched_rejects_the_wrong_number_of_pairs():
+    with pytest.raises(ValueError):
+        make_comparison({})._parse_batched(batched_response(1), 2)
+
+
+def test_parse_batched_rejects_invalid_json():
+    with pytest.raises(ValueError):
+        make_comparison({})._parse_batched("not json", 2)
+
+
+def test_batched_analysis_uses_a_single_call():
+    comparison = make_comparison({"gemini_batched": batched_response(2)})
+    differences, final = comparison.get_batched_analysis(ARTICLES)
+    assert comparison.calls == ["gemini_batched"]
+    assert len(differences) == 2
+    assert final["Final Sentiment Analysis"] == "Mixed coverage overall."
+
+
+@pytest.mark.parametrize("batched", ["not json", batched_response(1), json.dumps({"Coverage Differences": []})])
+def test_unusable_batched_response_falls_back_to_per_pair_calls(batched):
+    comparison = make_comparison({
+        "gemini_batched": batched,
+        "gemini_compare": json.dumps({"Comparison": "Per-pair comparison", "Impact": "Per-pair impact"}),
+        "gemini_final_sentiment": json.dumps({"Final Sentiment Analysis": "Per-pair summary"}),
+    })
+    differences, final = comparison.get_batched_analysis(ARTICLES)
+    assert comparison.calls.count("gemini_batched") == 1
+    assert comparison.calls.count("gemini_compare") == 2
+    assert differences == [{"Comparison": "Per-pair comparison", "Impact": "Per-pair impact"}] * 2
+    assert final == {"Final Sentiment Analysis": "Per-pair summary"}
+
+
+def test_async_flow_matches_the_sync_one():
+    responses = {
+        "gemini_batched": "not json",
+        "gemini_compare": json.dumps({"Comparison": "Per-pair comparison", "Impact": "Per-pair impact"}),
+        "gemini_final_sentiment": json.dumps({"Final Sentiment Analysis": "Per-pair summary"}),
+    }
+    comparison = make_comparison(responses)
+
+    async def generate_async(prompt, call="gemini"):
+        return comparison._generate(prompt, call)
+
+    comparison._generate_async = generate_async
+    expected = make_comparison(responses).get_batched_analysis(ARTICLES)
+    assert asyncio.run(comparison.get_batched_analysis_async(ARTICLES)) == expected
+
+
+def test_gemini_errors_become_placeholders():
+    comparison = make_comparison({})
+
+    def generate(prompt, call="gemini"):
+        raise RuntimeError("quota exceeded")
+
+    comparison._generate = generate
+    assert comparison.compare_two_articles(1, ARTICLES[0], ARTICLES[1], "key") == {
+        "Comparison": "Comparison unavailable", "Impact": "Impact analysis failed"
+    }
+    assert comparison.get_final_sentiment_analysis([{"Comparison": "c", "Impact": "i"}]) == {
+        "Final Sentiment Analysis": "Analysis failed"
+    }
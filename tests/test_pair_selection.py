@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+
+from summarization.llm_response import CoverageComparison, NO_COMPARISONS_ANALYSIS
+from summarization.pair_selection import PairSelector
+from summarization.response import NYTimesScraper
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "benchmarks", "fixtures", "nytimes_search.html")
+
+
+class FixtureResponse:
+    def __init__(self, path):
+        with open(path, encoding="utf-8") as page:
+            self.text = page.read()
+
+
+def fixture_articles():
+    return NYTimesScraper("Tesla", cache=None).extract_article_info(FixtureResponse(FIXTURE))
+
+
+def test_recorded_page_gets_pairs_up_to_the_budget():
+    articles = fixture_articles()
+    selector = PairSelector(budget=5)
+    similarity = selector.similarity_matrix(articles)
+    np.fill_diagonal(similarity, 0)
+    # The recorded stories are all distinct, so no pair clears the similarity bar
+    assert similarity.max() < selector.min_similarity
+
+    pairs = selector.select(articles)
+    assert len(pairs) == 5
+    assert all(0 <= i < j < len(articles) for i, j in pairs)
+
+
+def test_related_pairs_are_taken_before_unrelated_ones():
+    articles = [
+        {"title": "Tesla recalls cars", "summary": "Tesla recall of Model Y cars over brakes"},
+        {"title": "Apple earnings", "summary": "Apple reports record iPhone revenue"},
+        {"title": "Tesla recall widens", "summary": "Regulators widen the Tesla Model Y brakes recall"},
+        {"title": "Boeing deliveries", "summary": "Boeing delivered fewer aircraft this quarter"},
+    ]
+    pairs = PairSelector(budget=2).select(articles)
+    assert pairs[0] == (0, 2)
+    assert len(pairs) == 2
+
+
+def test_budget_and_article_reuse_are_respected():
+    articles = fixture_articles()
+    pairs = PairSelector(budget=3).select(articles)
+    assert len(pairs) == 3
+    used = [index for pair in pairs for index in pair]
+    assert len(used) == len(set(used))
+
+
+def test_final_sentiment_without_comparisons_skips_gemini():
+    comparison = CoverageComparison("key", cache=None)
+
+    def generate(prompt, call="gemini"):
+        raise AssertionError("Gemini must not be called without comparisons")
+
+    comparison._generate = generate
+    assert comparison.get_final_sentiment_analysis([]) == NO_COMPARISONS_ANALYSIS
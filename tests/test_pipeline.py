@@ -0,0 +1,208 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from pipeline import MicroBatcher, StageGraph
+from summarization.metrics import current_stage
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def diamond_graph(log):
+    """
+    a -> (b, c) -> d, where every stage logs its name when it runs.
+    """
+    def stage(name, value):
+        def run(*args):
+            log.append(name)
+            return value + sum(args)
+        return run
+
+    graph = StageGraph()
+    graph.add("a", stage("a", 1))
+    graph.add("b", stage("b", 10), deps=["a"])
+    graph.add("c", stage("c", 100), deps=["a"])
+    graph.add("d", stage("d", 1000), deps=["b", "c"])
+    return graph
+
+
+def test_stages_get_their_dependencies_results_in_order():
+    log = []
+    results, timings = diamond_graph(log).run()
+    assert results == {"a": 1, "b": 11, "c": 101, "d": 1112}
+    assert log[0] == "a" and log[-1] == "d"
+    assert set(timings) == {"a", "b", "c", "d"}
+    assert timings["d"]["start"] >= timings["b"]["start"]
+
+
+def test_async_run_matches_the_threaded_one():
+    results, _ = asyncio.run(diamond_graph([]).run_async())
+    assert results == diamond_graph([]).run()[0]
+
+
+def test_independent_stages_run_concurrently():
+    graph = StageGraph()
+    graph.add("first", lambda: time.sleep(0.2))
+    graph.add("second", lambda: time.sleep(0.2))
+    start = time.perf_counter()
+    graph.run()
+    assert time.perf_counter() - start < 0.35
+
+
+def test_coroutine_stages_are_awaited():
+    async def fetch():
+        await asyncio.sleep(0)
+        return 2
+
+    graph = StageGraph()
+    graph.add("fetch", fetch)
+    graph.add("double", lambda value: value * 2, deps=["fetch"])
+    results, _ = asyncio.run(graph.run_async())
+    assert results["double"] == 4
+
+
+def test_unknown_and_duplicate_stages_are_rejected():
+    graph = StageGraph().add("a", lambda: 1)
+    with pytest.raises(ValueError):
+        graph.add("a", lambda: 2)
+    with pytest.raises(ValueError):
+        graph.add("b", lambda value: value, deps=["missing"])
+
+
+def failing_graph(ran):
+    def fail():
+        raise RuntimeError("scrape failed")
+
+    graph = StageGraph()
+    graph.add("scrape", fail)
+    graph.add("analyze", lambda articles: ran.append("analyze"), deps=["scrape"])
+    return graph
+
+
+def test_a_failing_stage_stops_its_dependents():
+    ran, observed = [], []
+    graph = failing_graph(ran)
+    graph.observer = lambda stage, seconds, failed: observed.append((stage, failed))
+    with pytest.raises(RuntimeError, match="scrape failed"):
+        graph.run()
+    assert ran == []
+    assert observed == [("scrape", True)]
+
+
+def test_a_failing_stage_stops_its_dependents_async():
+    ran = []
+    with pytest.raises(RuntimeError, match="scrape failed"):
+        asyncio.run(failing_graph(ran).run_async())
+    assert ran == []
+
+
+def test_a_failure_cancels_the_running_async_stages():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    graph = StageGraph()
+    graph.add("slow", slow)
+    graph.add("fail", fail)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await graph.run_async()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert cancelled == ["slow"]
+
+
+def test_context_reaches_stage_threads():
+    def read():
+        return request_id.get(), current_stage.get(), threading.current_thread() is threading.main_thread()
+
+    graph = StageGraph().add("read", read)
+    request_id.set("report-1")
+    try:
+        threaded, _ = graph.run()
+        awaited, _ = asyncio.run(graph.run_async())
+    finally:
+        request_id.set(None)
+    assert threaded["read"] == ("report-1", "read", False)
+    assert awaited["read"] == ("report-1", "read", False)
+
+
+def test_micro_batcher_pools_concurrent_calls():
+    batches = []
+
+    def double_all(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(double_all)
+        return await asyncio.gather(*(batcher.submit(item) for item in range(5)))
+
+    assert asyncio.run(run()) == [0, 2, 4, 6, 8]
+    assert batches == [[0, 1, 2, 3, 4]]
+
+
+def test_micro_batcher_pools_calls_made_during_a_batch_into_the_next():
+    batches = []
+    first_batch_started = threading.Event()
+
+    def slow_identity(items):
+        batches.append(list(items))
+        first_batch_started.set()
+        time.sleep(0.1)
+        return list(items)
+
+    async def run():
+        batcher = MicroBatcher(slow_identity)
+        first = asyncio.ensure_future(batcher.submit("a"))
+        await asyncio.get_running_loop().run_in_executor(None, first_batch_started.wait)
+        later = await asyncio.gather(batcher.submit("b"), batcher.submit("c"))
+        return [await first] + later
+
+    assert asyncio.run(run()) == ["a", "b", "c"]
+    assert batches == [["a"], ["b", "c"]]
+
+
+def test_micro_batcher_fails_every_caller_of_a_failed_batch():
+    def fail(items):
+        raise ValueError("model crashed")
+
+    async def run():
+        batcher = MicroBatcher(fail)
+        return await asyncio.gather(*(batcher.submit(item) for item in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert len(errors) == 3
+    assert all(isinstance(error, ValueError) for error in errors)
+
+
+def test_micro_batcher_recovers_after_a_failed_batch():
+    calls = []
+
+    def flaky(items):
+        calls.append(list(items))
+        if len(calls) == 1:
+            raise ValueError("first batch fails")
+        return list(items)
+
+    async def run():
+        batcher = MicroBatcher(flaky)
+        with pytest.raises(ValueError):
+            await batcher.submit(1)
+        return await batcher.submit(2)
+
+    assert asyncio.run(run()) == 2
@@ -0,0 +1,46 @@
+from api import parse_range_header
+
+FILE_SIZE = 1000
+
+
+def test_closed_range():
+    assert parse_range_header("bytes=0-499", FILE_SIZE) == (0, 499)
+
+
+def test_closed_range_is_clamped_to_the_file():
+    assert parse_range_header("bytes=900-1999", FILE_SIZE) == (900, 999)
+
+
+def test_open_ended_range():
+    assert parse_range_header("bytes=500-", FILE_SIZE) == (500, 999)
+
+
+def test_suffix_range():
+    assert parse_range_header("bytes=-100", FILE_SIZE) == (900, 999)
+
+
+def test_suffix_longer_than_the_file():
+    assert parse_range_header("bytes=-5000", FILE_SIZE) == (0, 999)
+
+
+def test_empty_suffix_is_unsatisfiable():
+    assert parse_range_header("bytes=-0", FILE_SIZE) is None
+
+
+def test_start_past_the_end_is_unsatisfiable():
+    assert parse_range_header("bytes=1000-", FILE_SIZE) is None
+    assert parse_range_header("bytes=1000-1200", FILE_SIZE) is None
+
+
+def test_end_before_start_is_unsatisfiable():
+    assert parse_range_header("bytes=500-100", FILE_SIZE) is None
+
+
+def test_malformed_ranges():
+    assert parse_range_header("bytes=-", FILE_SIZE) is None
+    assert parse_range_header("items=0-10", FILE_SIZE) is None
+    assert parse_range_header("bytes=a-b", FILE_SIZE) is None
+
+
+def test_only_the_first_of_several_ranges_is_served():
+    assert parse_range_header("bytes=0-9, 20-29", FILE_SIZE) == (0, 9)
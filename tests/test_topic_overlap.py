@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from utils import analyze_article_topics_pairs
+
+
+def naive_topic_pairs(articles):
+    """
+    The original quadratic implementation, which compared each article with the union
+    of every other article's topics.
+    """
+    if not articles:
+        return {}
+    processed = []
+    for article in articles:
+        topics = article.get('topics') if isinstance(article.get('topics'), list) else []
+        case_mapping = {}
+        for word in topics:
+            case_mapping.setdefault(word.lower(), word)
+        processed.append({'original': topics, 'normalized': set(case_mapping), 'case_mapping': case_mapping})
+
+    result = {'common_words_across_pairs': []}
+    for i in range(0, len(processed) - 1, 2):
+        common = processed[i]['normalized'] & processed[i + 1]['normalized']
+        result['common_words_across_pairs'].extend(processed[i]['case_mapping'][word] for word in common)
+
+    for i, article in enumerate(processed):
+        other_sets = [processed[j]['normalized'] for j in range(len(processed)) if j != i]
+        unique = article['normalized'] - set.union(*other_sets) if other_sets else article['normalized']
+        result[f'unique_words_in_article_{i+1}'] = [word for word in article['original'] if word.lower() in unique]
+    return result
+
+
+def random_articles(seed, count):
+    rng = random.Random(seed)
+    vocabulary = ["Tesla", "tesla", "Recall", "Musk", "musk", "China", "Battery", "Stock", "Profit", "Robotaxi"]
+    articles = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            articles.append({"title": "No topics"})
+        else:
+            articles.append({"topics": rng.sample(vocabulary, rng.randint(0, 5))})
+    return articles
+
+
+def normalized(result):
+    # Common words come from set intersections, so their order is not meaningful
+    return {**result, 'common_words_across_pairs': sorted(result.get('common_words_across_pairs', []))}
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("count", [1, 2, 5, 10])
+def test_matches_the_original_implementation(seed, count):
+    articles = random_articles(seed, count)
+    assert normalized(analyze_article_topics_pairs(articles)) == normalized(naive_topic_pairs(articles))
+
+
+def test_no_articles():
+    assert analyze_article_topics_pairs([]) == naive_topic_pairs([]) == {}
+
+
+def test_overlap_matrix_counts_shared_topics_of_every_pair():
+    articles = random_articles(7, 8)
+    result = analyze_article_topics_pairs(articles, include_overlap_matrix=True)
+
+    topic_sets = [{word.lower() for word in article.get('topics', [])} for article in articles]
+    expected = [
+        {'articles': [i + 1, j + 1], 'shared_topics': len(topic_sets[i] & topic_sets[j])}
+        for i in range(len(articles)) for j in range(i + 1, len(articles))
+        if topic_sets[i] & topic_sets[j]
+    ]
+    assert result['pairwise_overlap'] == expected
+    assert normalized({k: v for k, v in result.items() if k != 'pairwise_overlap'}) == \
+        normalized(naive_topic_pairs(articles))
@@ -1,3 +1,5 @@
+import numpy as np
+
 def get_sentiment_distribution(articles):
     """
     Calculate the distribution of sentiment labels from a list of articles.
@@ -34,6 +36,45 @@ def get_sentiment_distribution(articles):
 
     return sentiment_distribution
 
+def get_sentiment_statistics(articles):
+    """
+    Summarizes the VADER compound scores of a list of articles.
+
+    Args:
+        articles (list): A list of dictionaries representing articles, where each
+                        dictionary may contain a 'sentiment_score' key with the
+                        compound score in [-1, 1].
+
+    Returns:
+        dict: {'mean': float, 'median': float, 'std': float, 'min': float,
+               'max': float, 'net': float}, where 'net' is the share of positive
+               minus the share of negative articles. All values are 0.0 when no
+               article has a score.
+
+    Example:
+        >>> get_sentiment_statistics([{'sentiment_score': 0.5, 'sentiment': 'positive'},
+        ...                           {'sentiment_score': -0.1, 'sentiment': 'neutral'}])
+        {'mean': 0.2, 'median': 0.2, 'std': 0.3, 'min': -0.1, 'max': 0.5, 'net': 0.5}
+    """
+    scores = np.array([
+        article["sentiment_score"] for article in articles
+        if isinstance(article, dict) and article.get("sentiment_score") is not None
+    ], dtype=float)
+    if scores.size == 0:
+        return {"mean": 0.0, "median": 0.0, "std": 0.0, "min": 0.0, "max": 0.0, "net": 0.0}
+
+    distribution = get_sentiment_distribution(articles)
+    net = (distribution["positive"] - distribution["negative"]) / max(sum(distribution.values()), 1)
+
+    return {
+        "mean": round(float(scores.mean()), 4),
+        "median": round(float(np.median(scores)), 4),
+        "std": round(float(scores.std()), 4),
+        "min": round(float(scores.min()), 4),
+        "max": round(float(scores.max()), 4),
+        "net": round(float(net), 4),
+    }
+
 # def analyze_article_topics(articles):
 #     """
 #     Analyzes topics across multiple articles to find common and unique topics,
@@ -111,44 +152,95 @@ def get_sentiment_distribution(articles):
     
 #     return result
 
-def analyze_article_topics_pairs(articles):
+def build_topic_index(articles):
     """
-    Analyzes topics across pairs of articles to find common and unique topics,
-    with case-insensitive comparison while preserving original case in results.
-    Returns a single list of common words across pairs.
+    Normalizes every article's topics and builds an inverted index from each
+    normalized (lowercase) topic to the articles that mention it, in one pass.
 
     Args:
         articles: List of dictionaries, each containing a 'topics' key with a list of words
 
     Returns:
-        A dictionary with:
-        - 'common_words_across_pairs': List of words common to pairs of articles
-        - 'unique_words_in_article_X': List of words unique to each article (X is index, original case preserved)
+        tuple: (processed, index) where processed holds, per article, its 'original'
+               topics, 'normalized' topic set and 'case_mapping' (normalized word to
+               its first spelling), and index maps each normalized topic to the sorted
+               list of article positions that mention it.
     """
-    if not articles:
-        return {}
-
     processed_articles = []
-    for article in articles:
+    index = {}
+    for position, article in enumerate(articles):
         if 'topics' not in article or not isinstance(article['topics'], list):
             processed_articles.append({'original': [], 'normalized': set(), 'case_mapping': {}})
             continue
 
         case_mapping = {}
-        normalized_topics = set()
-
         for word in article['topics']:
             normalized = word.lower()
             if normalized not in case_mapping:
                 case_mapping[normalized] = word
-            normalized_topics.add(normalized)
+                index.setdefault(normalized, []).append(position)
 
         processed_articles.append({
             'original': article['topics'],
-            'normalized': normalized_topics,
+            'normalized': set(case_mapping),
             'case_mapping': case_mapping
         })
 
+    return processed_articles, index
+
+def topic_overlap_matrix(articles, topic_index=None):
+    """
+    Counts the topics shared by every pair of articles as a sparse matrix. Only pairs
+    that share a topic are stored, so the cost follows the number of overlaps rather
+    than the number of pairs.
+
+    Args:
+        articles: List of dictionaries, each containing a 'topics' key with a list of words
+        topic_index (tuple, optional): The result of `build_topic_index` for the same articles.
+
+    Returns:
+        scipy.sparse.csr_matrix: n x n matrix whose (i, j) entry is the number of
+                                 normalized topics articles i and j have in common
+                                 (the diagonal holds each article's topic count).
+    """
+    from scipy import sparse
+
+    _, index = topic_index or build_topic_index(articles)
+    rows, columns = [], []
+    for column, positions in enumerate(index.values()):
+        rows.extend(positions)
+        columns.extend([column] * len(positions))
+    incidence = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, columns)), shape=(len(articles), len(index))
+    )
+    return (incidence @ incidence.T).tocsr()
+
+def analyze_article_topics_pairs(articles, include_overlap_matrix=False):
+    """
+    Analyzes topics across pairs of articles to find common and unique topics,
+    with case-insensitive comparison while preserving original case in results.
+    Returns a single list of common words across pairs.
+
+    Unique topics come from an inverted index of topic to articles, so the analysis
+    is linear in the total number of topics instead of quadratic in the number of articles.
+
+    Args:
+        articles: List of dictionaries, each containing a 'topics' key with a list of words
+        include_overlap_matrix (bool): If True, also return the topics shared by every
+                                       pair of articles, not only adjacent ones.
+
+    Returns:
+        A dictionary with:
+        - 'common_words_across_pairs': List of words common to pairs of articles
+        - 'unique_words_in_article_X': List of words unique to each article (X is index, original case preserved)
+        - 'pairwise_overlap' (only with include_overlap_matrix): List of
+          {'articles': [X, Y], 'shared_topics': count} for every pair sharing a topic
+    """
+    if not articles:
+        return {}
+
+    processed_articles, index = build_topic_index(articles)
+
     result = {
         'common_words_across_pairs': []
     }
@@ -164,11 +256,9 @@ def analyze_article_topics_pairs(articles):
             common_words = [article1['case_mapping'].get(word, word) for word in common_normalized]
             result['common_words_across_pairs'].extend(common_words)
 
-    # Find unique words for each article
+    # A topic is unique to an article when the index lists no other article for it
     for i, article in enumerate(processed_articles):
-        other_sets = [processed_articles[j]['normalized'] for j in range(len(processed_articles)) if j != i]
-
-        unique_normalized = article['normalized'] - set.union(*other_sets) if other_sets else article['normalized']
+        unique_normalized = {word for word in article['normalized'] if len(index[word]) == 1}
 
         unique_words = []
         if unique_normalized:
@@ -177,4 +267,13 @@ def analyze_article_topics_pairs(articles):
 
         result[f'unique_words_in_article_{i+1}'] = unique_words
 
-    return result
\ No newline at end of file
+    if include_overlap_matrix:
+        from scipy import sparse
+
+        overlap = sparse.triu(topic_overlap_matrix(articles, (processed_articles, index)), k=1).tocoo()
+        result['pairwise_overlap'] = [
+            {'articles': [int(i) + 1, int(j) + 1], 'shared_topics': int(count)}
+            for i, j, count in sorted(zip(overlap.row, overlap.col, overlap.data))
+        ]
+
+    return result